@@ -0,0 +1,60 @@
+"""
+Check that the forecast archive keeps columns aligned across appends.
+
+Appends hourly sections to a scratch archive, adding a variable partway
+through, and checks that rows from before the variable existed read back as
+NaN, both before and after compact().
+
+    python -m benchmarks.archive_check
+"""
+
+import sys
+import tempfile
+
+import numpy as np
+
+from utils.forecast_archive import ForecastArchive
+
+KEY = "40.0000_-75.0000"
+
+def _section(start_hour, count, **variables):
+    hours = np.datetime64("2025-01-01T00:00") + np.arange(start_hour, start_hour + count) * np.timedelta64(1, "h")
+    return {"utc_offset_seconds": 0,
+            "hourly": {"time": [str(t) for t in hours], **{k: list(v) for k, v in variables.items()}}}
+
+def _check(archive, errors, label):
+    time, values = archive.query(KEY, ["temperature_2m", "precipitation"])
+    if len(time) != 6:
+        errors.append(f"{label}: expected 6 rows, got {len(time)}")
+    if not np.isnan(values["precipitation"][:3]).all():
+        errors.append(f"{label}: rows before precipitation was added read back as {values['precipitation'][:3]}")
+    if not np.array_equal(values["precipitation"][3:], [1.0, 2.0, 3.0]):
+        errors.append(f"{label}: precipitation differs: {values['precipitation'][3:]}")
+    if not np.array_equal(values["temperature_2m"], [10.0, 11.0, 12.0, 13.0, 14.0, 15.0]):
+        errors.append(f"{label}: temperature_2m differs: {values['temperature_2m']}")
+
+def main():
+    errors = []
+    with tempfile.TemporaryDirectory() as root:
+        archive = ForecastArchive(root)
+        # Out of order, so compact() has work to do
+        archive.append(KEY, _section(3, 3, temperature_2m=[13.0, 14.0, 15.0], precipitation=[1.0, 2.0, 3.0]))
+        archive.append(KEY, _section(0, 3, temperature_2m=[10.0, 11.0, 12.0]))
+        _check(archive, errors, "sorted by query")
+
+    with tempfile.TemporaryDirectory() as root:
+        archive = ForecastArchive(root)
+        archive.append(KEY, _section(0, 3, temperature_2m=[10.0, 11.0, 12.0]))
+        archive.append(KEY, _section(3, 3, temperature_2m=[13.0, 14.0, 15.0], precipitation=[1.0, 2.0, 3.0]))
+        _check(archive, errors, "new variable")
+        archive.append(KEY, _section(0, 1, temperature_2m=[10.0]))
+        archive.compact()
+        _check(archive, errors, "after compact")
+
+    for error in errors:
+        print(error)
+    print(f"Archive check: {'FAIL' if errors else 'OK'}")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
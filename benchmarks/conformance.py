@@ -0,0 +1,113 @@
+"""
+Check that the FlatBuffers and JSON response paths decode to the same forecast.
+
+Compare the committed fixtures offline:
+    python -m benchmarks.conformance
+The committed fixtures are synthesized by the local stand-in server:
+    python -m benchmarks.conformance --synthesize
+Record fixtures from the live API instead (needs network access):
+    python -m benchmarks.conformance --record
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from models.Forecast import Forecast
+from models.weatherapi.constants import BASE_URL
+from models.weatherapi.request import build_forecast_request
+from models.weatherapi.response import decode_response, split_forecast_response
+from models.weatherapi.transport import HTTPTransport
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# float32 on the wire vs. JSON decimals
+TOLERANCE = 1e-4
+
+FIXTURE_REQUESTS = {
+    "single_location": dict(
+        latitude=40.55, longitude=-89.64, timezone="America/Chicago", past_days=2, forecast_days=7,
+        hourly=["temperature_2m", "weather_code", "precipitation", "relative_humidity_2m", "wind_speed_10m"],
+        daily=["temperature_2m_max", "temperature_2m_min", "weather_code", "sunrise", "sunset", "precipitation_sum"],
+    ),
+    "multi_location": dict(
+        latitude=[40.55, 34.05, 47.61], longitude=[-89.64, -118.24, -122.33],
+        timezone=["America/Chicago", "America/Los_Angeles", "America/Los_Angeles"], forecast_days=3,
+        hourly=["temperature_2m", "weather_code", "precipitation"],
+        daily=["temperature_2m_max", "temperature_2m_min", "weather_code"],
+    ),
+}
+
+def record(base_url=BASE_URL):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    transport = HTTPTransport()
+    for name, kwargs in FIXTURE_REQUESTS.items():
+        for fmt in ("json", "flatbuffers"):
+            response = transport.get(base_url, params=build_forecast_request(format=fmt, **kwargs))
+            response.raise_for_status()
+            with open(os.path.join(FIXTURE_DIR, f"{name}.{fmt}"), "wb") as file:
+                file.write(response.content)
+        print(f"Recorded {name}")
+
+def _compare_tables(label, expected, actual):
+    errors = []
+    if not np.array_equal(expected.time, actual.time):
+        errors.append(f"{label}: time axes differ")
+    for name, column in expected.columns.items():
+        other = actual.column(name)
+        if other is None:
+            errors.append(f"{label}: missing {name}")
+        elif column.dtype.kind == "M":
+            if not np.array_equal(column, other):
+                errors.append(f"{label}: {name} differs")
+        elif not np.allclose(column, other, atol=TOLERANCE, equal_nan=True):
+            errors.append(f"{label}: {name} differs")
+    return errors
+
+def compare():
+    errors = []
+    checked = 0
+    for name, kwargs in FIXTURE_REQUESTS.items():
+        paths = {fmt: os.path.join(FIXTURE_DIR, f"{name}.{fmt}") for fmt in ("json", "flatbuffers")}
+        if not all(os.path.exists(p) for p in paths.values()):
+            continue
+
+        count = len(kwargs["latitude"]) if isinstance(kwargs["latitude"], list) else 1
+        results = {}
+        for fmt, path in paths.items():
+            with open(path, "rb") as file:
+                body = file.read()
+            params = build_forecast_request(format=fmt, **kwargs)
+            results[fmt] = split_forecast_response(decode_response(body, params), count)
+
+        for i, (expected, actual) in enumerate(zip(results["json"], results["flatbuffers"])):
+            expected = Forecast.from_response(None, expected)
+            actual = Forecast.from_response(None, actual)
+            errors += _compare_tables(f"{name}[{i}].hourly", expected.hourly_conditions, actual.hourly_conditions)
+            errors += _compare_tables(f"{name}[{i}].daily", expected.daily_conditions, actual.daily_conditions)
+        checked += 1
+
+    if not checked:
+        print("No recorded fixtures found; run with --synthesize or --record first.")
+        return 1
+    for error in errors:
+        print(error)
+    print(f"Checked {checked} fixture(s): {'FAIL' if errors else 'OK'}")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--record", action="store_true", help="fetch and store fresh fixtures from the live API")
+    source.add_argument("--synthesize", action="store_true", help="store fixtures from the local stand-in server")
+    args = parser.parse_args()
+    if args.record:
+        record()
+    elif args.synthesize:
+        from benchmarks.fake_server import FakeOpenMeteoServer
+
+        with FakeOpenMeteoServer() as server:
+            record(server.url)
+    sys.exit(compare())
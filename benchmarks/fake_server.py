@@ -0,0 +1,212 @@
+"""
+Local stand-in for the Open-Meteo forecast endpoint.
+
+Serves deterministic synthetic data shaped by the request: one object per
+requested coordinate, every requested hourly/daily variable, and
+(past_days + forecast_days) days of data, or the start_date/end_date and
+start_hour/end_hour ranges when given. Like the real API, days start at local
+midnight in the requested timezone, iso8601 times are local and unixtime
+times are UTC, with the zone's offset at the first time applied throughout.
+Hourly values depend only on the coordinate and the absolute time, so
+overlapping requests agree. format=flatbuffers
+returns the same data as size-prefixed FlatBuffers messages.
+"""
+
+import gzip
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Naive: the first local day of every series
+START = datetime(2025, 1, 1)
+
+def _zone(name):
+    """tzinfo for a timezone parameter; GMT for none/auto, as the API's default."""
+    if not name or name in ("GMT", "UTC", "auto"):
+        return timezone.utc
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(name)
+
+def _series(seed, count, base, spread, first=0):
+    return [round(base + spread * (((seed * 31 + i * 17) % 97) / 97.0 - 0.5), 1) for i in range(first, first + count)]
+
+def synthetic_location(latitude, longitude, hourly=(), daily=(), days=7, timeformat="iso8601",
+                       first_day=0, first_hour=None, hour_count=None, models=(), tz=None):
+    seed = int(abs(latitude * 1000 + longitude * 10))
+    if first_hour is None:
+        first_hour, hour_count = first_day * 24, days * 24
+    hours = [START + timedelta(hours=first_hour + h) for h in range(hour_count)]
+    dates = [START + timedelta(days=first_day + d) for d in range(days)]
+
+    zone = _zone(tz)
+    first = hours[0] if hours else dates[0]
+    offset = zone.utcoffset(first)
+    offset_seconds = int(offset.total_seconds())
+    # Hourly values follow the absolute (UTC) hour, not the local one
+    utc_hour = first_hour - offset_seconds // 3600
+    # Like the real API, several models give one "<variable>_<model>" series per model
+    variants = [(f"_{model}", 7 * k) for k, model in enumerate(models)] if len(models) > 1 else [("", 0)]
+
+    def times(values, fmt):
+        if timeformat == "unixtime":
+            return [int((t - offset).replace(tzinfo=timezone.utc).timestamp()) for t in values]
+        return [t.strftime(fmt) for t in values]
+
+    result = {
+        "latitude": latitude, "longitude": longitude, "elevation": 100.0,
+        "generationtime_ms": 0.1, "utc_offset_seconds": offset_seconds,
+        "timezone": "GMT" if zone is timezone.utc else tz,
+        "timezone_abbreviation": "GMT" if zone is timezone.utc else zone.tzname(first),
+    }
+    if hourly:
+        result["hourly"] = {"time": times(hours, "%Y-%m-%dT%H:%M")}
+        for i, name in enumerate(hourly):
+            for suffix, shift in variants:
+                if name == "weather_code":
+                    values = [(0, 1, 3, 61, 63, 95)[(seed + shift + h // 3) % 6]
+                              for h in range(utc_hour, utc_hour + hour_count)]
+                else:
+                    values = _series(seed + shift + i, hour_count, 10.0, 20.0, utc_hour)
+                result["hourly"][name + suffix] = values
+    if daily:
+        result["daily"] = {"time": times(dates, "%Y-%m-%d")}
+        for i, name in enumerate(daily):
+            for suffix, shift in variants:
+                if name in ("sunrise", "sunset"):
+                    at = timedelta(hours=6 if name == "sunrise" else 18)
+                    values = times([d + at for d in dates], "%Y-%m-%dT%H:%M")
+                elif name == "weather_code":
+                    values = [(0, 3, 61)[(seed + shift + d) % 3] for d in range(first_day, first_day + days)]
+                else:
+                    values = _series(seed + shift + i, days, 10.0, 20.0, first_day)
+                result["daily"][name + suffix] = values
+    return result
+
+def encode_flatbuffers(results, hourly=(), daily=()):
+    """
+    Encode unixtime synthetic_location results as the API's FlatBuffers body:
+    one size-prefixed WeatherApiResponse per location. Variables are written
+    in request order without their enum ids, which the client doesn't read.
+    """
+    import flatbuffers
+    import numpy as np
+
+    def section(builder, data, names, interval):
+        variables = []
+        for name in names:
+            values = data[name]
+            if name in ("sunrise", "sunset"):
+                vector, slot = builder.CreateNumpyVector(np.asarray(values, dtype=np.int64)), 4
+            else:
+                vector, slot = builder.CreateNumpyVector(np.asarray(values, dtype=np.float32)), 3
+            builder.StartObject(12)
+            builder.PrependUOffsetTRelativeSlot(slot, vector, 0)
+            variables.append(builder.EndObject())
+        builder.StartVector(4, len(variables), 4)
+        for variable in reversed(variables):
+            builder.PrependUOffsetTRelative(variable)
+        vector = builder.EndVector()
+
+        time = data["time"]
+        builder.StartObject(4)
+        builder.PrependInt64Slot(0, time[0], 0)
+        builder.PrependInt64Slot(1, time[-1] + interval, 0)
+        builder.PrependInt32Slot(2, interval, 0)
+        builder.PrependUOffsetTRelativeSlot(3, vector, 0)
+        return builder.EndObject()
+
+    body = bytearray()
+    for result in results:
+        builder = flatbuffers.Builder(1024)
+        blocks = {}
+        if hourly:
+            blocks[11] = section(builder, result["hourly"], hourly, 3600)
+        if daily:
+            blocks[10] = section(builder, result["daily"], daily, 86400)
+        timezone_name = builder.CreateString(result["timezone"])
+        abbreviation = builder.CreateString(result["timezone_abbreviation"])
+
+        builder.StartObject(14)
+        builder.PrependFloat32Slot(0, result["latitude"], 0.0)
+        builder.PrependFloat32Slot(1, result["longitude"], 0.0)
+        builder.PrependFloat32Slot(2, result["elevation"], 0.0)
+        builder.PrependFloat32Slot(3, result["generationtime_ms"], 0.0)
+        builder.PrependInt32Slot(6, result["utc_offset_seconds"], 0)
+        builder.PrependUOffsetTRelativeSlot(7, timezone_name, 0)
+        builder.PrependUOffsetTRelativeSlot(8, abbreviation, 0)
+        for slot, block in blocks.items():
+            builder.PrependUOffsetTRelativeSlot(slot, block, 0)
+        builder.FinishSizePrefixed(builder.EndObject())
+        body += builder.Output()
+    return bytes(body)
+
+class FakeOpenMeteoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        latitudes = [float(v) for v in query.get("latitude", "0").split(",")]
+        longitudes = [float(v) for v in query.get("longitude", "0").split(",")]
+        hourly = query["hourly"].split(",") if query.get("hourly") else ()
+        daily = query["daily"].split(",") if query.get("daily") else ()
+        days = int(query.get("past_days", 0)) + int(query.get("forecast_days", 7))
+        first_day, first_hour, hour_count = 0, None, None
+        if query.get("start_date") and query.get("end_date"):
+            start, end = (datetime.fromisoformat(query[k]) for k in ("start_date", "end_date"))
+            first_day, days = (start - START).days, (end - start).days + 1
+        if query.get("start_hour") and query.get("end_hour"):
+            start, end = (datetime.fromisoformat(query[k]) for k in ("start_hour", "end_hour"))
+            first_hour = int((start - START).total_seconds()) // 3600
+            hour_count = int((end - start).total_seconds()) // 3600 + 1
+
+        flatbuffers = query.get("format") == "flatbuffers"
+        timeformat = "unixtime" if flatbuffers else query.get("timeformat", "iso8601")
+        # One timezone for every location, or one per location
+        timezones = query.get("timezone", "GMT").split(",")
+        if len(timezones) == 1:
+            timezones *= len(latitudes)
+        results = [synthetic_location(lat, lng, hourly, daily, days, timeformat,
+                                      first_day, first_hour, hour_count,
+                                      query["models"].split(",") if query.get("models") else (), tz)
+                   for lat, lng, tz in zip(latitudes, longitudes, timezones)]
+        if flatbuffers:
+            body = encode_flatbuffers(results, hourly, daily)
+        else:
+            body = json.dumps(results if len(results) > 1 else results[0]).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream" if flatbuffers else "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeOpenMeteoServer:
+    """Run the stand-in server on a background thread; use as a context manager."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self._server = ThreadingHTTPServer((host, port), FakeOpenMeteoHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/forecast"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
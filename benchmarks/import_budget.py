@@ -0,0 +1,59 @@
+"""
+Fail if the interactive entry point gets slow to import.
+
+Imports `main` in a fresh interpreter several times and checks that:
+- the best cold import time stays within the budget
+- none of the heavy dependencies are loaded before the zipcode prompt
+
+    python -m benchmarks.import_budget [--budget-ms 50]
+
+The budget can also be set with IMPORT_BUDGET_MS.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 50.0
+
+# Must not be imported just to reach "ready to accept a zipcode"
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "requests", "urllib3", "asyncio", "sqlite3", "openmeteo_sdk"]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1e3, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+def probe(root):
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=root, env=dict(os.environ, PYTHONPATH=root),
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the cold import time of main.py.")
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = [probe(root) for _ in range(args.runs)]
+    best = min(r["ms"] for r in results)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+
+    print(f"import main: best {best:.1f} ms of {args.runs} runs (budget {args.budget_ms:.1f} ms)")
+    failed = False
+    if best > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if loaded:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(loaded)}")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Offline benchmarks for the forecast hot paths.
+
+    python -m benchmarks.run                      # run and compare against baseline.json
+    python -m benchmarks.run --save-baseline      # run and store results as the new baseline
+    python -m benchmarks.run --locations 50 --days 16 --variables 20 --output results.json
+
+Exits with status 1 if any benchmark's best (minimum) time is slower than
+its baseline by more than --threshold. The minimum is used because it is
+the least sensitive to scheduling noise on a shared machine.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_server import FakeOpenMeteoServer, synthetic_location
+from models.Forecast import Forecast
+from models.Location import Location
+from models.weatherapi.constants import HOURLY_VARIABLES
+from models.weatherapi.request import build_forecast_request, ForecastRequestTemplate
+from models.weatherapi.WeatherAPI import WeatherAPI
+from utils.get_location import load_zipcode_database
+from utils.zipcode_index import compile_zipcode_index, load_zipcode_index
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DAILY = ["temperature_2m_max", "temperature_2m_min", "weather_code", "sunrise", "sunset", "precipitation_sum"]
+
+def measure(fn, repeat):
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "mean_s": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+
+def _hourly_variables(count):
+    names = ["temperature_2m", "weather_code", "precipitation"]
+    names += [v for v in HOURLY_VARIABLES if v not in names]
+    return names[:count]
+
+def _write_zipcodes(path, count):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["zip", "lat", "lng", "city", "state_id", "state_name", "timezone"])
+        for i in range(count):
+            writer.writerow([f"{i:05d}", 25 + (i % 2400) / 100, -125 + (i % 5800) / 100,
+                             f"City {i}", "IL", "Illinois", "America/Chicago"])
+
+def run(args):
+    results = {}
+    hourly = _hourly_variables(args.variables)
+    locations = [Location(30 + i * 0.37, -100 + i * 0.53, "", "", "", "GMT") for i in range(args.locations)]
+    request_kwargs = dict(hourly=hourly, daily=DAILY, forecast_days=args.days, timezone="GMT")
+
+    results["build_forecast_request"] = measure(
+        lambda: build_forecast_request([l.lat for l in locations], [l.lng for l in locations], **request_kwargs),
+        args.repeat * 10)
+    template = ForecastRequestTemplate(**request_kwargs)
+    results["request_template"] = measure(
+        lambda: template.params([l.lat for l in locations], [l.lng for l in locations]),
+        args.repeat * 10)
+
+    with FakeOpenMeteoServer() as server:
+        api = WeatherAPI(base_url=server.url)
+        results["get_forecast"] = measure(
+            lambda: api.get_forecast(locations[0].lat, locations[0].lng, **request_kwargs), args.repeat)
+        results["get_forecasts"] = measure(lambda: api.get_forecasts(locations, **request_kwargs), args.repeat)
+        api.close()
+
+    response = synthetic_location(locations[0].lat, locations[0].lng, hourly, DAILY, args.days)
+    results["forecast_from_response"] = measure(lambda: Forecast.from_response(locations[0], response), args.repeat)
+    unix_response = synthetic_location(locations[0].lat, locations[0].lng, hourly, DAILY, args.days, "unixtime")
+    results["forecast_from_response_unixtime"] = measure(
+        lambda: Forecast.from_response(locations[0], unix_response).getSummary(), args.repeat)
+
+    forecast = Forecast.from_response(locations[0], response)
+    results["get_day_forecast"] = measure(
+        lambda: [Forecast.from_response(locations[0], response).getDayForecast(day["date"])
+                 for day in forecast.getHighLowTemps()],
+        args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "zipcodes.csv")
+        index_path = os.path.join(tmp, "zipcodes.idx")
+        _write_zipcodes(csv_path, args.zipcodes)
+        lookups = [f"{i:05d}" for i in range(0, args.zipcodes, max(1, args.zipcodes // 1000))]
+
+        results["load_zipcode_database"] = measure(lambda: load_zipcode_database(csv_path), args.repeat)
+        results["compile_zipcode_index"] = measure(lambda: compile_zipcode_index(csv_path, index_path), args.repeat)
+
+        def index_lookups():
+            index = load_zipcode_index(index_path, csv_path)
+            for zipcode in lookups:
+                Location.from_zipcode(zipcode, index)
+            index.close()
+        results["zipcode_index_lookup_1000"] = measure(index_lookups, args.repeat)
+
+    return results
+
+def compare(results, baseline, threshold):
+    """Per-benchmark change in best time vs the baseline; the table is printed to stderr."""
+    comparison = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["min_s"], result["min_s"]
+        change = (after - before) / before if before else 0.0
+        comparison[name] = {"baseline_min_s": before, "min_s": after, "change": change,
+                            "regression": change > threshold}
+        flag = "REGRESSION" if change > threshold else "ok"
+        print(f"{name:28s} {before * 1e3:10.3f} ms -> {after * 1e3:10.3f} ms  {change:+7.1%}  {flag}",
+              file=sys.stderr)
+    return comparison
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the forecast hot paths.")
+    parser.add_argument("--locations", type=int, default=20)
+    parser.add_argument("--variables", type=int, default=10, help="hourly variables per request")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--zipcodes", type=int, default=40000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline, e.g. 0.25 = 25%%")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # Keep stdout clean for the JSON report; everything else goes to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run(args)
+    report = {"config": {k: getattr(args, k) for k in ("locations", "variables", "days", "zipcodes", "repeat")},
+              "results": results}
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    elif not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --save-baseline first.", file=sys.stderr)
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("config") != report["config"]:
+            print("Warning: baseline was recorded with a different configuration.", file=sys.stderr)
+        comparison = compare(results, baseline["results"], args.threshold)
+        report["comparison"] = {
+            "baseline": args.baseline,
+            "threshold": args.threshold,
+            "results": comparison,
+            "regressions": [name for name, row in comparison.items() if row["regression"]],
+        }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    return 1 if report.get("comparison", {}).get("regressions") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
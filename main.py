@@ -1,42 +1,116 @@
-from models import Location
-from models.weatherapi.WeatherAPI import WeatherAPI
-from utils.get_location import load_zipcode_database, getLocationInput
+import sys
 
-def main():
-    zipcode_db = load_zipcode_database()
+from models.Location import Location
+from utils.config import ZIPCODE, FORECAST_REQUEST
+from utils.get_location import getLocationInput
+from utils.zipcode_index import load_zipcode_index
+
+def main(archive_dir=None, rate_limit=None):
+    zipcode_db = load_zipcode_index()
     zipcode = getLocationInput()
-    
-    for entry in zipcode_db:
-        if entry.get('zip') == zipcode:
-            location_data = {
-                'lat': float(entry.get('lat', 0)),
-                'lng': float(entry.get('lng', 0)),
-                'city': entry.get('city', ''),
-                'state': entry.get('state_id', ''),
-                'display_name': f"{entry.get('city', '')}, {entry.get('state_id', '')}",
-                'timezone': entry.get('timezone', 'America/Chicago')
-            }
-            location = Location.from_zipcode_data(location_data)
-            break
-    else:
+
+    location = Location.from_zipcode(zipcode, zipcode_db)
+    if location is None:
         print(f"Zipcode {zipcode} not found. Using default location.")
+        location = Location.from_zipcode(ZIPCODE, zipcode_db)
+        if location is None:
+            return
+
+    # Deferred so startup reaches the zipcode prompt without loading numpy/requests
+    from models.Forecast import Forecast
+    from models.weatherapi.WeatherAPI import WeatherAPI
+    from models.weatherapi.cache import ForecastCache
+    from models.weatherapi.scheduler import make_scheduler
         
-    weather_api = WeatherAPI()
+    weather_api = WeatherAPI(cache=ForecastCache(path="utils/forecast_cache.sqlite"), scheduler=make_scheduler(rate_limit))
     
     forecast_data = weather_api.get_forecast(        
         latitude=location.lat,
         longitude=location.lng,
-        hourly=["temperature_2m", "weather_code"],
-        daily=["temperature_2m_max", "temperature_2m_min", "weather_code"],
         timezone=location.timezone,
-        temperature_unit="fahrenheit"
+        **FORECAST_REQUEST
     )
     if forecast_data:
+        if archive_dir:
+            from utils.forecast_archive import ForecastArchive, location_key
+            ForecastArchive(archive_dir).append(location_key(location), forecast_data)
+
         print(f"Weather forecast for {location.display_name}")
+        forecast = Forecast.from_response(location, forecast_data)
+        for day in forecast.getSummary():
+            print(f"{day['date']:%a %b %d}: {day['emoji']} {day['description']}, "
+                  f"high {day['high']['temp']}, low {day['low']['temp']}")
 
     else:
         print("Unable to retrieve forecast data.")    
     
 
+def batch(path, workers, group_size, dedupe=False, archive_dir=None, rate_limit=None):
+    import json
+
+    from models.weatherapi.WeatherAPI import WeatherAPI
+    from models.weatherapi.cache import ForecastCache
+    from models.weatherapi.scheduler import make_scheduler
+    from utils.batch import run_batch
+    from utils.forecast_archive import ForecastArchive
+    from utils.spatial_index import SpatialIndex
+
+    # Progress messages go to stderr so stdout stays pure NDJSON
+    sys.stdout, stdout = sys.stderr, sys.stdout
+    try:
+        zipcode_db = load_zipcode_index()
+        spatial_index = SpatialIndex.from_zipcode_db(zipcode_db) if len(zipcode_db) else None
+        weather_api = WeatherAPI(cache=ForecastCache(), scheduler=make_scheduler(rate_limit))
+        source = sys.stdin if path == "-" else open(path)
+        with source:
+            summary = run_batch(source, weather_api, zipcode_db, FORECAST_REQUEST,
+                                spatial_index=spatial_index, output=stdout,
+                                workers=workers, group_size=group_size, dedupe=dedupe,
+                                archive=ForecastArchive(archive_dir) if archive_dir else None)
+    finally:
+        sys.stdout = stdout
+    print(json.dumps(summary), file=sys.stderr)
+
+
+def serve(host, port, rate_limit=None):
+    from utils.server import ForecastService, serve as serve_forecasts
+    from utils.spatial_index import SpatialIndex
+
+    zipcode_db = load_zipcode_index()
+    spatial_index = SpatialIndex.from_zipcode_db(zipcode_db) if len(zipcode_db) else None
+    serve_forecasts(ForecastService(zipcode_db, spatial_index, FORECAST_REQUEST, rate_limit=rate_limit), host, port)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Weather forecasts from Open-Meteo.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="read zipcodes or lat,lng pairs from FILE ('-' for stdin) and write NDJSON forecasts")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent requests in batch mode")
+    parser.add_argument("--group-size", type=int, default=100, help="locations per request in batch mode")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="fetch locations that share a weather-model grid cell once in batch mode "
+                             "(needs cell_selection=nearest and models on one regular grid)")
+    parser.add_argument("--archive", metavar="DIR",
+                        help="also append every fetched forecast to the on-disk archive in DIR")
+    parser.add_argument("--rate-limit", metavar="SPEC",
+                        help="API call budget for this process, e.g. '600/min,5000/hour,10000/day' (the free tier, "
+                             "default) or 'off' for a commercial key; defaults to $OPEN_METEO_RATE_LIMIT")
+    parser.add_argument("--serve", action="store_true", help="run the forecast HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    if args.rate_limit is not None:
+        from models.weatherapi.scheduler import parse_rate_limits
+        try:
+            parse_rate_limits(args.rate_limit)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.batch:
+        batch(args.batch, args.workers, args.group_size, args.dedupe, args.archive, args.rate_limit)
+    elif args.serve:
+        serve(args.host, args.port, args.rate_limit)
+    else:
+        main(args.archive, args.rate_limit)
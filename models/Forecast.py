@@ -1,4 +1,11 @@
 #Forecast class
+from contextlib import nullcontext
+
+import numpy as np
+
+from models.ForecastTable import ForecastTable, HOURLY_FIELDS, DAILY_FIELDS, _scalar
+from models.ForecastRollup import DailyRollup, PARTS_OF_DAY
+from models.ModelEnsemble import ModelEnsemble
 
 class Forecast:
 
@@ -8,79 +15,184 @@ class Forecast:
         self.end_date = end_date
         self.hourly_conditions = hourly_conditions
         self.daily_conditions = daily_conditions
+        self.utc_offset_seconds = 0
+        # Per-model hourly data when built from several models
+        self.ensemble = None
+        self._rollup = None
+
+    @classmethod
+    def from_response(cls, location, response, instrumentation=None):
+        """Build a Forecast straight from an Open-Meteo response, storing hourly/daily data as columns."""
+        if not response:
+            return None
 
-    def _get_dominant_condition(self, hours):
-        if not hours:
+        with instrumentation.stage("model") if instrumentation else nullcontext():
+            offset = response.get('utc_offset_seconds', 0)
+            hourly = ForecastTable.from_section(response.get('hourly'), HOURLY_FIELDS, offset)
+            daily = ForecastTable.from_section(response.get('daily'), DAILY_FIELDS, offset)
+
+        span = daily.time if len(daily) else hourly.time
+        start_date = span[0].astype('datetime64[s]').item() if len(span) else None
+        end_date = span[-1].astype('datetime64[s]').item() if len(span) else None
+
+        forecast = cls(location, start_date, end_date, hourly, daily)
+        forecast.utc_offset_seconds = offset
+        return forecast
+
+    @classmethod
+    def from_model_responses(cls, location, model_responses):
+        """
+        Build the consensus Forecast of several models from the
+        (models, response) pairs of WeatherAPI.get_model_forecasts: hourly and
+        daily values are the model mean, weather codes the most common code.
+        The per-model hourly data is kept on `ensemble` for getConsensus().
+        """
+        hourly = ModelEnsemble.from_responses(model_responses, "hourly")
+        daily = ModelEnsemble.from_responses(model_responses, "daily")
+        if not hourly.models and not daily.models:
             return None
-        
-        code_counts = {}
 
-        for hour in hours:
-            code_counts[hour.weather_code] = code_counts.get(hour.weather_code, 0) + 1
+        forecast = cls.from_response(location, {
+            "hourly": hourly.consensus_section() if hourly.models else None,
+            "daily": daily.consensus_section() if daily.models else None,
+        })
+        forecast.utc_offset_seconds = next(response.get('utc_offset_seconds', 0) for _, response in model_responses)
+        forecast.ensemble = hourly
+        return forecast
+
+    def advance(self, now, hourly_windows=(), daily_window=None):
+        """
+        Roll the forecast forward in place so it starts at `now` (local wall
+        time), then merge partial responses into it: rows matching a window's
+        times are overwritten and rows freed by the roll are filled from the
+        window's later rows. Hourly rows before now's hour, and daily rows
+        before its date (only if `daily_window` is given), are dropped.
+        """
+        self.rollup()
+        hourly, daily = self.hourly_conditions, self.daily_conditions
+        now = np.datetime64(now, "s")
+
+        hourly.shift(int(np.searchsorted(hourly.time, now)))
+        for response in hourly_windows:
+            offset = response.get('utc_offset_seconds', 0)
+            hourly.merge(ForecastTable.from_section(response.get('hourly'), HOURLY_FIELDS, offset))
+            self.utc_offset_seconds = offset
+
+        if daily_window is not None:
+            daily.shift(int(np.searchsorted(daily.time, now.astype("datetime64[D]"))))
+            offset = daily_window.get('utc_offset_seconds', 0)
+            daily.merge(ForecastTable.from_section(daily_window.get('daily'), DAILY_FIELDS, offset))
+
+        span = daily.time if len(daily) else hourly.time
+        span = span[~np.isnat(span)]
+        self.start_date = span[0].astype('datetime64[s]').item() if len(span) else None
+        self.end_date = span[-1].astype('datetime64[s]').item() if len(span) else None
+        self._rollup = None
+
+    def getConsensus(self, date=None, variables=("temperature_2m", "precipitation")):
+        """
+        Hour-by-hour model agreement for one day: the consensus weather code
+        with the fraction of models agreeing on it, and the mean, min, max and
+        spread of each variable across models.
+        """
+        if self.ensemble is None:
+            return None
+        if date is None:
+            date = self.start_date
 
-        dominant_code = max(code_counts, key=code_counts.get)
+        rollup = self.rollup()
+        day = rollup.find_day(date)
+        if day < 0:
+            return None
 
-        for hour in hours:
-            if hour.weather_code == dominant_code:
-                return hour
+        ensemble = self.ensemble
+        hours = rollup.hour_indices(day)
+        codes, agreement = ensemble.agreement("weather_code")
+        stats = {name: ensemble.statistics(name) for name in variables if name in ensemble.values}
+        return [
+            {
+                "time": _scalar(ensemble.time[i]),
+                "weather_code": int(codes[i]) if codes is not None and codes[i] == codes[i] else None,
+                "agreement": _scalar(agreement[i]) if agreement is not None else None,
+                **{name: {key: _scalar(values[i]) for key, values in stat.items()} for name, stat in stats.items()},
+            }
+            for i in hours
+        ]
+
+    def rollup(self):
+        """Per-day rollups for the whole forecast, computed once on first use."""
+        if self._rollup is None:
+            if not isinstance(self.hourly_conditions, ForecastTable):
+                self.hourly_conditions = ForecastTable.from_conditions(self.hourly_conditions, HOURLY_FIELDS)
+            if not isinstance(self.daily_conditions, ForecastTable):
+                self.daily_conditions = ForecastTable.from_conditions(self.daily_conditions, DAILY_FIELDS)
+            self._rollup = DailyRollup(self.hourly_conditions, self.daily_conditions)
+        return self._rollup
+
+    def _hour(self, index):
+        return self.hourly_conditions[int(index)] if index >= 0 else None
+
+    def _extreme(self, day, kind):
+        rollup = self.rollup()
+        values, indices = (rollup.high, rollup.high_index) if kind == "high" else (rollup.low, rollup.low_index)
+        if indices[day] >= 0:
+            return {"temp": float(values[day]), "time": _scalar(self.hourly_conditions.time[indices[day]])}
+
+        daily_summary = self.daily_conditions[day] if len(self.daily_conditions) else None
+        fallback = getattr(daily_summary, f"{kind}_temp", None) if daily_summary else None
+        return {"temp": fallback, "time": None}
 
     def getDayForecast(self, date=None):
         if date is None:
             date = self.start_date
 
-        daily_summary = None
-        for day in self.daily_conditions:
-            if day.time.date() == date.date():
-                daily_summary = day
-                break
-        
-        if not daily_summary:
+        rollup = self.rollup()
+        day = rollup.find_day(date)
+        if day < 0 or not len(self.daily_conditions):
             return None
-        
-        hours = []
-
-        for hour in self.hourly_conditions:
-            if hour.time.date() == date.date():
-                hours.append(hour)
-
-        precipitation_hours = sum(1 for h in hours if getattr(h, 'precipitation', 0) > 0.1)
 
-        morning_hours = [h for h in hours if 6 <= h.time.hour < 12]
-        afternoon_hours = [h for h in hours if 12 <= h.time.hour < 18]
-        evening_hours = [h for h in hours if 18 <= h.time.hour < 22]
-
-        morning_weather = self._get_dominant_condition(morning_hours) if morning_hours else None
-        afternoon_weather = self._get_dominant_condition(afternoon_hours) if afternoon_hours else None
-        evening_weather = self._get_dominant_condition(evening_hours) if evening_hours else None
-
-        high_temp = max(hours, key=lambda h: h.temperature) if hours else None
-        low_temp = min(hours, key=lambda h: h.temperature) if hours else None
+        daily_summary = self.daily_conditions[day]
+        hours = [self.hourly_conditions[int(i)] for i in rollup.hour_indices(day)]
+        parts = {name: self._hour(rollup.dominant_index[day, i]) for i, name in enumerate(PARTS_OF_DAY)}
 
         return {
                 "date": date,
                 "location": self.location,
                 "summary": daily_summary,
-                "high": {
-                    "temp": high_temp.temperature if high_temp else daily_summary.high_temp,
-                    "time": high_temp.time if high_temp else None
-                },
-                "low": {
-                    "temp": low_temp.temperature if low_temp else daily_summary.low_temp,
-                    "time": low_temp.time if low_temp else None
-                },
-                "precipitation_hours": precipitation_hours,
-                "parts_of_day": {
-                    "morning": morning_weather,
-                    "afternoon": afternoon_weather, 
-                    "evening": evening_weather
-                },
+                "high": self._extreme(day, "high"),
+                "low": self._extreme(day, "low"),
+                "precipitation_hours": int(rollup.precipitation_hours[day]),
+                "parts_of_day": parts,
                 "hourly": hours,
                 "emoji": daily_summary.getEmoji(),
                 "description": daily_summary.getDescription()
             }
 
     def getHighLowTemps(self):
-        pass
+        rollup = self.rollup()
+        return [
+            {
+                "date": _scalar(rollup.days[day]),
+                "high": self._extreme(day, "high"),
+                "low": self._extreme(day, "low"),
+            }
+            for day in range(len(rollup.days))
+        ]
 
     def getSummary(self):
-        pass
\ No newline at end of file
+        rollup = self.rollup()
+        summary = []
+        for day, temps in enumerate(self.getHighLowTemps()):
+            daily_summary = self.daily_conditions[day] if len(self.daily_conditions) else None
+            summary.append({
+                **temps,
+                "precipitation_hours": int(rollup.precipitation_hours[day]),
+                "weather_code": daily_summary.weather_code if daily_summary else None,
+                "emoji": daily_summary.getEmoji() if daily_summary else None,
+                "description": daily_summary.getDescription() if daily_summary else None,
+                "parts_of_day": {
+                    name: int(code) if code >= 0 else None
+                    for name, code in zip(PARTS_OF_DAY, rollup.dominant_code[day])
+                },
+            })
+        return summary
@@ -0,0 +1,96 @@
+# Per-day rollups computed for every day of a forecast at once
+import numpy as np
+
+PARTS_OF_DAY = ("morning", "afternoon", "evening")
+
+# [start, end) hour of each part of day
+PART_HOURS = ((6, 12), (12, 18), (18, 22))
+
+PRECIPITATION_THRESHOLD = 0.1
+
+def _first_per_group(groups, keys):
+    """Index of the smallest key within each group (earliest index on ties), and the group it belongs to."""
+    order = np.lexsort((keys, groups))
+    sorted_groups = groups[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    return order[first], sorted_groups[first]
+
+class DailyRollup:
+    """
+    High/low temperatures and their hours, precipitation hours and the
+    dominant weather code per part of day, for all days in one pass.
+
+    Index arrays (high_index, low_index, dominant_index) point into the
+    hourly table and are -1 where a day has no usable data.
+    """
+
+    def __init__(self, hourly, daily):
+        hour_days = hourly.dates
+        if len(daily):
+            self.days = daily.dates
+        else:
+            self.days = np.unique(hour_days[~np.isnat(hour_days)])
+        n_days = len(self.days)
+
+        day_index = np.searchsorted(self.days, hour_days)
+        in_range = day_index < n_days
+        in_range[in_range] = self.days[day_index[in_range]] == hour_days[in_range]
+        day_index[~in_range] = -1
+        self.day_index = day_index
+        hour_of_day = hourly.hour_of_day
+
+        self.high = np.full(n_days, np.nan)
+        self.low = np.full(n_days, np.nan)
+        self.high_index = np.full(n_days, -1, dtype=np.int64)
+        self.low_index = np.full(n_days, -1, dtype=np.int64)
+        temps = hourly.column("temperature_2m")
+        if temps is not None:
+            valid = in_range & ~np.isnan(temps)
+            rows = np.flatnonzero(valid)
+            for keys, values, indices in ((-temps[rows], self.high, self.high_index),
+                                          (temps[rows], self.low, self.low_index)):
+                picked, days = _first_per_group(day_index[rows], keys)
+                indices[days] = rows[picked]
+                values[days] = temps[rows[picked]]
+
+        self.precipitation_hours = np.zeros(n_days, dtype=np.int64)
+        precipitation = hourly.column("precipitation")
+        if precipitation is not None:
+            wet = in_range & (np.nan_to_num(precipitation) > PRECIPITATION_THRESHOLD)
+            self.precipitation_hours = np.bincount(day_index[wet], minlength=n_days)
+
+        self.dominant_code = np.full((n_days, len(PARTS_OF_DAY)), -1, dtype=np.int64)
+        self.dominant_index = np.full((n_days, len(PARTS_OF_DAY)), -1, dtype=np.int64)
+        codes = hourly.column("weather_code")
+        if codes is not None and n_days:
+            part = np.full(len(hour_of_day), -1)
+            for i, (start, end) in enumerate(PART_HOURS):
+                part[(hour_of_day >= start) & (hour_of_day < end)] = i
+            valid = in_range & (part >= 0) & ~np.isnan(codes)
+            rows = np.flatnonzero(valid)
+            code = np.clip(codes[rows].astype(np.int64), 0, 99)
+            slot = (day_index[rows] * len(PARTS_OF_DAY) + part[rows]) * 100 + code
+
+            size = n_days * len(PARTS_OF_DAY) * 100
+            counts = np.bincount(slot, minlength=size).reshape(n_days, len(PARTS_OF_DAY), 100)
+            first_seen = np.full(size, len(hour_of_day), dtype=np.int64)
+            np.minimum.at(first_seen, slot, rows)
+            first_seen = first_seen.reshape(counts.shape)
+
+            # Most frequent code; ties go to the code seen first
+            top = counts == counts.max(axis=2, keepdims=True)
+            candidates = np.where(top & (counts > 0), first_seen, len(hour_of_day))
+            chosen = candidates.argmin(axis=2)
+            has_data = counts.max(axis=2) > 0
+            self.dominant_code[has_data] = chosen[has_data]
+            self.dominant_index[has_data] = candidates.min(axis=2)[has_data]
+
+    def find_day(self, date):
+        """Index of `date` in the rollup, or -1."""
+        day = np.datetime64(date.date() if hasattr(date, "date") else date, "D")
+        i = int(np.searchsorted(self.days, day))
+        return i if i < len(self.days) and self.days[i] == day else -1
+
+    def hour_indices(self, day):
+        return np.flatnonzero(self.day_index == day)
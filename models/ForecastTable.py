@@ -0,0 +1,187 @@
+# Columnar storage for hourly/daily forecast data
+import numpy as np
+
+from models.WeatherCondition import WeatherCondition
+
+# WeatherCondition attribute -> Open-Meteo variable, per section
+HOURLY_FIELDS = {
+    "temperature": "temperature_2m",
+    "weather_code": "weather_code",
+    "humidity": "relative_humidity_2m",
+    "wind_speed": "wind_speed_10m",
+    "precipitation": "precipitation",
+}
+
+# Several attributes may share a column; the first listed is the column's own
+# field and later ones are aliases, used only where the first is unset
+DAILY_FIELDS = {
+    "high_temp": "temperature_2m_max",
+    "temperature": "temperature_2m_max",
+    "low_temp": "temperature_2m_min",
+    "weather_code": "weather_code",
+    "wind_speed": "wind_speed_10m_max",
+    "precipitation": "precipitation_sum",
+    "sunrise": "sunrise",
+    "sunset": "sunset",
+}
+
+def to_datetime64(values, utc_offset_seconds=0):
+    """ISO8601 strings or unixtime seconds -> datetime64[s] in local wall time."""
+    values = np.asarray(values)
+    if values.dtype.kind in "iuf":
+        return (values.astype(np.int64) + utc_offset_seconds).astype("datetime64[s]")
+    return values.astype("datetime64[s]")
+
+def _scalar(value):
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else value.astype("datetime64[s]").item()
+    value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+class ForecastTable:
+    """
+    One array per variable over a shared time axis.
+
+    Indexing a row builds a WeatherCondition view on demand; nothing is
+    materialized per hour until a caller asks for it.
+    """
+
+    def __init__(self, time, columns, fields):
+        self.time = time
+        self.columns = columns
+        self.fields = {attr: name for attr, name in fields.items() if name in columns}
+        self._time_parts = None
+
+    @classmethod
+    def from_section(cls, section, fields, utc_offset_seconds=0):
+        if not section or "time" not in section:
+            return cls(np.empty(0, dtype="datetime64[s]"), {}, fields)
+
+        time = to_datetime64(section["time"], utc_offset_seconds)
+        columns = {}
+        for name, values in section.items():
+            if name == "time":
+                continue
+            if name in ("sunrise", "sunset"):
+                columns[name] = to_datetime64(values, utc_offset_seconds)
+            else:
+                columns[name] = np.asarray(values, dtype=np.float64)
+        return cls(time, columns, fields)
+
+    @classmethod
+    def from_conditions(cls, conditions, fields):
+        """Build a table from a list of WeatherCondition objects."""
+        time = np.array([c.time for c in conditions], dtype="datetime64[s]")
+        sources = {}
+        for attr, name in fields.items():
+            sources.setdefault(name, []).append(attr)
+
+        columns = {}
+        for name, attrs in sources.items():
+            values = [next((v for v in (getattr(c, attr, None) for attr in attrs) if v is not None), None)
+                      for c in conditions]
+            if name in ("sunrise", "sunset"):
+                columns[name] = np.array(values, dtype="datetime64[s]")
+            else:
+                columns[name] = np.array(values, dtype=np.float64)
+        return cls(time, columns, fields)
+
+    def __len__(self):
+        return len(self.time)
+
+    def __iter__(self):
+        for i in range(len(self.time)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.time)))]
+
+        values = {attr: _scalar(self.columns[name][i]) for attr, name in self.fields.items()}
+        if values.get("weather_code") is not None:
+            values["weather_code"] = int(values["weather_code"])
+        return WeatherCondition(
+            time=_scalar(self.time[i]),
+            temperature=values.get("temperature"),
+            weather_code=values.get("weather_code"),
+            description=None,
+            humidity=values.get("humidity"),
+            wind_speed=values.get("wind_speed"),
+            sunrise=values.get("sunrise"),
+            sunset=values.get("sunset"),
+            precipitation=values.get("precipitation"),
+            high_temp=values.get("high_temp"),
+            low_temp=values.get("low_temp"),
+        )
+
+    def column(self, name):
+        return self.columns.get(name)
+
+    def _parts(self):
+        # Day number and hour of day straight from the local epoch seconds, derived once
+        if self._time_parts is None:
+            seconds = self.time.astype("datetime64[s]").view(np.int64)
+            dates = (seconds // 86400).astype("datetime64[D]")
+            dates[np.isnat(self.time)] = np.datetime64("NaT")
+            self._time_parts = (dates, seconds % 86400 // 3600)
+        return self._time_parts
+
+    @property
+    def dates(self):
+        """Local date of each row as datetime64[D] (NaT for empty rows)."""
+        return self._parts()[0]
+
+    @property
+    def hour_of_day(self):
+        """Local hour (0-23) of each row."""
+        return self._parts()[1]
+
+    def _writable(self):
+        # Columns decoded straight from a response buffer may be read-only views
+        if not self.time.flags.writeable:
+            self.time = self.time.copy()
+        for name, values in self.columns.items():
+            if not values.flags.writeable:
+                self.columns[name] = values.copy()
+
+    def shift(self, n):
+        """Drop the first n rows in place, leaving n empty (NaT/NaN) rows at the end."""
+        n = min(n, len(self.time))
+        if n <= 0:
+            return
+        self._writable()
+        self._time_parts = None
+        for values in (self.time, *self.columns.values()):
+            values[:-n] = values[n:].copy()
+            values[-n:] = np.datetime64("NaT") if values.dtype.kind == "M" else np.nan
+
+    def merge(self, window):
+        """
+        Overwrite rows in place with the rows of `window` that have the same
+        time; window rows later than the last filled row go into the empty
+        rows left by shift(). Returns the number of rows written.
+        """
+        if not len(window) or not len(self.time):
+            return 0
+        self._writable()
+        self._time_parts = None
+
+        empty = np.isnat(self.time)
+        filled = int(np.argmax(empty)) if empty.any() else len(self.time)
+        position = np.searchsorted(self.time[:filled], window.time)
+        matched = position < filled
+        matched[matched] = self.time[position[matched]] == window.time[matched]
+
+        newer = window.time > self.time[filled - 1] if filled else np.ones(len(window), dtype=bool)
+        appended = np.flatnonzero(newer)[:len(self.time) - filled]
+        source = np.concatenate([np.flatnonzero(matched), appended])
+        target = np.concatenate([position[matched], np.arange(filled, filled + len(appended))])
+
+        self.time[target] = window.time[source]
+        for name, values in self.columns.items():
+            incoming = window.columns.get(name)
+            if incoming is not None:
+                values[target] = incoming[source]
+        return len(target)
@@ -1,4 +1,17 @@
 # location data structures
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def get_zoneinfo(name):
+    """ZoneInfo for an IANA timezone name, loaded once per name (UTC if unknown)."""
+    from datetime import timezone
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
 class Location:
     
     def __init__(self, lat, lng, city, state, display_name, timezone):
@@ -22,18 +35,22 @@ class Location:
     
     @classmethod
     def from_zipcode(cls, zipcode, zipcode_db):
-        for entry in zipcode_db:
-            if entry.get('zip') == zipcode:
-                
-                return cls(
-                    lat = float(entry.get('lat', 0)),
-                    lng = float(entry.get('lng', 0)),
-                    city = entry.get('city', ''),
-                    state = entry.get('state_id', ''),
-                    display_name = display_name,
-                    timezone = entry.get('timezone', 'america/chicago'),
-                )
-        return None
+        entry = zipcode_db.get(zipcode)
+        if entry is None:
+            return None
+
+        return cls(
+            lat = float(entry.get('lat', 0)),
+            lng = float(entry.get('lng', 0)),
+            city = entry.get('city', ''),
+            state = entry.get('state_id', ''),
+            display_name = f"{entry.get('city', '')}, {entry.get('state_id', '')}",
+            timezone = entry.get('timezone', 'America/Chicago'),
+        )
+
+    @property
+    def tzinfo(self):
+        return get_zoneinfo(self.timezone)
 
     def to_dict(self):
         return {
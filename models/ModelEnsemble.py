@@ -0,0 +1,118 @@
+# Multi-model forecasts aligned on one time axis, with per-step consensus statistics
+import numpy as np
+
+from models.ForecastTable import to_datetime64
+
+# Astronomical values are identical across models, so they are taken from the first model
+SHARED_VARIABLES = ("sunrise", "sunset")
+
+class ModelEnsemble:
+    """
+    One section (hourly or daily) of several models' forecasts for a location.
+
+    `values[variable]` is a (models, time) float array, NaN where a model has
+    no value for a step, so every statistic is a single reduction over axis 0.
+    """
+
+    def __init__(self, models, time, values, shared=None):
+        self.models = list(models)
+        self.time = time
+        self.values = values
+        # SHARED_VARIABLES as local datetime64 on the same time axis
+        self.shared = shared or {}
+
+    @classmethod
+    def from_responses(cls, model_responses, section="hourly"):
+        """
+        Build from [(models, response), ...]. A response for several models
+        has one "<variable>_<model>" series per model; a single-model response
+        has plain variable names. Time axes are merged, so responses that were
+        fetched separately line up even if their ranges differ.
+        """
+        models, times, series = [], [], []
+        shared = {}
+        for group, response in model_responses:
+            data = (response or {}).get(section)
+            if not data or "time" not in data:
+                continue
+            offset = response.get("utc_offset_seconds", 0)
+            time = to_datetime64(data["time"], offset)
+            names = [name for name in data if name != "time"]
+            for model in group:
+                suffix = f"_{model}" if len(group) > 1 else ""
+                columns = {}
+                for name in names:
+                    if suffix and not name.endswith(suffix):
+                        continue
+                    variable = name[:-len(suffix)] if suffix else name
+                    if variable in SHARED_VARIABLES:
+                        shared.setdefault(variable, (time, to_datetime64(data[name], offset)))
+                    else:
+                        columns[variable] = data[name]
+                models.append(model)
+                times.append(time)
+                series.append(columns)
+
+        if not models:
+            return cls([], np.empty(0, dtype="datetime64[s]"), {})
+
+        axis = times[0] if all(len(t) == len(times[0]) and (t == times[0]).all() for t in times) \
+            else np.unique(np.concatenate(times))
+        variables = list(dict.fromkeys(name for columns in series for name in columns))
+        values = {name: np.full((len(models), len(axis)), np.nan) for name in variables}
+        for row, (time, columns) in enumerate(zip(times, series)):
+            position = np.searchsorted(axis, time)
+            for name, column in columns.items():
+                values[name][row, position] = np.asarray(column, dtype=np.float64)
+        for name, (time, column) in shared.items():
+            aligned = np.full(len(axis), np.datetime64("NaT"), dtype="datetime64[s]")
+            aligned[np.searchsorted(axis, time)] = column
+            shared[name] = aligned
+        return cls(models, axis, values, shared)
+
+    def __len__(self):
+        return len(self.time)
+
+    def statistics(self, variable):
+        """Per-step mean, min, max, spread (max - min) and count of models with a value."""
+        values = self.values.get(variable)
+        if values is None:
+            return None
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        empty = count == 0
+        mean = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(count, 1)
+        minimum = np.where(valid, values, np.inf).min(axis=0)
+        maximum = np.where(valid, values, -np.inf).max(axis=0)
+        for array in (mean, minimum, maximum):
+            array[empty] = np.nan
+        return {"mean": mean, "min": minimum, "max": maximum, "spread": maximum - minimum, "count": count}
+
+    def agreement(self, variable="weather_code"):
+        """
+        Per-step consensus of a categorical variable: (mode, fraction of models
+        with a value that agree on it). Ties go to the model listed first.
+        """
+        values = self.values.get(variable)
+        if values is None:
+            return None, None
+        steps = np.arange(values.shape[1])
+        votes = (values[:, None, :] == values[None, :, :]).sum(axis=1)
+        best = votes.argmax(axis=0)
+        count = (~np.isnan(values)).sum(axis=0)
+        mode = values[best, steps]
+        fraction = np.where(count > 0, votes[best, steps] / np.maximum(count, 1), np.nan)
+        return mode, fraction
+
+    def consensus_section(self):
+        """
+        Section dict of the consensus forecast, in local time: mean of numeric
+        variables, mode of weather_code, and the first reported sunrise/sunset.
+        """
+        section = {"time": self.time, **self.shared}
+        for name in self.values:
+            if name == "weather_code":
+                section[name] = self.agreement(name)[0]
+            else:
+                section[name] = self.statistics(name)["mean"]
+        return section
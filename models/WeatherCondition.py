@@ -1,7 +1,87 @@
 # Weather data structures and models
+from utils.config import WEATHER_CODES
+
+UNKNOWN_EMOJI = "🌤️ unknown condition"
+UNKNOWN_DESCRIPTION = "unknown condition; probably certain death"
+UNKNOWN_SEVERITY = -1
+
+# (codes, emoji, short description, severity 0-5)
+CODE_GROUPS = [
+    ((0,), "☀️", "clear sky", 0),
+    ((1, 2, 3), "🌤️", "partly cloudy", 0),
+    ((45, 48), "🌫️", "foggy", 1),
+    ((51, 53, 55), "🌦️", "drizzle", 1),
+    ((61, 63, 65), "🌧️", "rain", 2),
+    ((80, 81, 82), "🌧️", "rain showers", 2),
+    ((56, 57, 66, 67), "❄️☔", "freezing rain", 3),
+    ((71, 73, 75, 77, 85, 86), "🌨️", "snow", 2),
+    ((95,), "🌩️", "thunderstorm", 4),
+    ((96, 99), "🌩️🧊", "thunderstorm with hail likely", 5),
+]
+
+def _build_code_table():
+    # Index 100 holds the unknown-code entry so out-of-range codes map to it directly
+    emoji = [UNKNOWN_EMOJI] * 101
+    short = [UNKNOWN_DESCRIPTION] * 101
+    detailed = [UNKNOWN_DESCRIPTION] * 101
+    severity = [UNKNOWN_SEVERITY] * 101
+    for codes, group_emoji, group_short, group_severity in CODE_GROUPS:
+        for code in codes:
+            emoji[code] = group_emoji
+            short[code] = group_short
+            detailed[code] = WEATHER_CODES.get(code, group_short)
+            severity[code] = group_severity
+    return emoji, short, detailed, severity
+
+CODE_EMOJI, CODE_DESCRIPTION, CODE_DETAILED_DESCRIPTION, CODE_SEVERITY = _build_code_table()
+UNKNOWN_CODE = 100
+
+# NumPy copies of the table for the array helpers, built on first use
+_arrays = {}
+
+def _array(name):
+    if not _arrays:
+        import numpy as np
+
+        _arrays["emoji"] = np.array(CODE_EMOJI, dtype=object)
+        _arrays["description"] = np.array(CODE_DESCRIPTION, dtype=object)
+        _arrays["detailed"] = np.array(CODE_DETAILED_DESCRIPTION, dtype=object)
+        _arrays["severity"] = np.array(CODE_SEVERITY, dtype=np.int8)
+    return _arrays[name]
+
+def _code_index(code):
+    if code is None:
+        return UNKNOWN_CODE
+    try:
+        index = int(code)
+    except (TypeError, ValueError):
+        return UNKNOWN_CODE
+    return index if index == code and 0 <= index < 100 else UNKNOWN_CODE
+
+def _code_indices(codes):
+    import numpy as np
+
+    codes = np.asarray(codes, dtype=np.float64)
+    valid = (codes >= 0) & (codes < 100) & (codes == np.floor(codes))
+    return np.where(valid, codes, UNKNOWN_CODE).astype(np.intp)
+
+def describe(codes, detailed=False):
+    """Map an array of weather codes to descriptions in one lookup."""
+    return _array("detailed" if detailed else "description")[_code_indices(codes)]
+
+def emoji(codes):
+    """Map an array of weather codes to emoji in one lookup."""
+    return _array("emoji")[_code_indices(codes)]
+
+def severity(codes):
+    return _array("severity")[_code_indices(codes)]
 
 class WeatherCondition:
-    def __init__(self, time, temperature, weather_code, description, humidity, wind_speed, sunrise, sunset):
+    __slots__ = ("time", "temperature", "weather_code", "description", "humidity", "wind_speed",
+                 "sunrise", "sunset", "precipitation", "high_temp", "low_temp")
+
+    def __init__(self, time, temperature, weather_code, description, humidity, wind_speed, sunrise, sunset,
+                 precipitation=None, high_temp=None, low_temp=None):
         self.time = time
         self.temperature = temperature
         self.weather_code = weather_code
@@ -10,50 +90,27 @@ class WeatherCondition:
         self.wind_speed = wind_speed
         self.sunrise = sunrise
         self.sunset = sunset
+        self.precipitation = precipitation
+        self.high_temp = high_temp
+        self.low_temp = low_temp
 
     def getEmoji(self):
-        if self.weather_code == 0:
-            return "☀️"
-        elif self.weather_code in [1,2,3]:
-            return "🌤️"
-        elif self.weather_code in [45, 48]:
-            return "🌫️"
-        elif self.weather_code in [51,53,55]:
-            return "🌦️"
-        elif self.weather_code in [61,63,65]:
-            return "🌧️"
-        elif self.weather_code in [56, 57, 66,67]:
-            return "❄️☔"
-        elif self.weather_code in [71,73,75, 77, 85, 86]:
-            return "🌨️"
-        elif self.weather_code == 95:
-            return "🌩️"
-        elif self.weather_code in [96,99]:
-            return "🌩️🧊"
-        else:
-            return "🌤️ unknown condition"
+        return CODE_EMOJI[_code_index(self.weather_code)]
         
     def getDescription(self):
-        if self.weather_code == 0:
-            return "clear sky"
-        elif self.weather_code in [1,2,3]:
-            return "partly cloudy"
-        elif self.weather_code in [45, 48]:
-            return "foggy"
-        elif self.weather_code in [51,53,55]:
-            return "drizzle"
-        elif self.weather_code in [61,63,65]:
-            return "rain"
-        elif self.weather_code in [56, 57, 66, 67]:
-            return "freezing rain"
-        elif self.weather_code in [71,73,75, 77, 85, 86]:
-            return "snow"
-        elif self.weather_code == 95:
-            return "thunderstorm"
-        elif self.weather_code in [96,99]:
-            return "thunderstorm with hail likely"
-        else:
-            return "unknown condition; probably certain death"
+        return CODE_DESCRIPTION[_code_index(self.weather_code)]
+
+    def getDetailedDescription(self):
+        return CODE_DETAILED_DESCRIPTION[_code_index(self.weather_code)]
+
+    def getSeverity(self):
+        return CODE_SEVERITY[_code_index(self.weather_code)]
+
+    def to_dict(self):
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result['description'] = self.description or self.getDescription()
+        result['emoji'] = self.getEmoji()
+        return result
         
     def __str__(self):
-        return self.getDescription()
\ No newline at end of file
+        return self.getDescription()
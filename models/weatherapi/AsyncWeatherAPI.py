@@ -0,0 +1,97 @@
+import asyncio
+from .constants import BASE_URL
+from .request import build_forecast_request
+from .response import decode_response, process_forecast_response
+from .async_transport import AsyncHTTPTransport, TransportError
+from .cache import request_key
+from .singleflight import AsyncSingleFlight
+from .instrumentation import NULL_INSTRUMENTATION
+
+class AsyncWeatherAPI:
+    """
+    asyncio counterpart to WeatherAPI.
+
+    At most `max_in_flight` requests are outstanding at once; further calls
+    wait for a slot rather than opening more connections.
+    """
+
+    def __init__(self, transport=None, base_url=BASE_URL, max_in_flight=100, instrumentation=None):
+        self.transport = transport or AsyncHTTPTransport(max_idle=max_in_flight)
+        self.base_url = base_url
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._inflight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.transport.close()
+
+    async def get_forecast(self, latitude, longitude, **kwargs):
+        with self.instrumentation.stage("build"):
+            params = build_forecast_request(latitude, longitude, **kwargs)
+        response = await self._make_request(params)
+        with self.instrumentation.stage("validate"):
+            return process_forecast_response(response)
+
+    async def forecasts_as_completed(self, locations, **kwargs):
+        """
+        Fetch a forecast per location concurrently, yielding (location, forecast)
+        pairs in completion order. Each location uses its own timezone unless
+        `timezone` is given.
+        """
+        timezone = kwargs.pop("timezone", None)
+
+        async def fetch(location):
+            forecast = await self.get_forecast(location.lat, location.lng,
+                                               timezone=timezone or location.timezone, **kwargs)
+            return location, forecast
+
+        tasks = [asyncio.ensure_future(fetch(location)) for location in locations]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _make_request(self, params):
+        # Concurrent identical requests share one upstream fetch
+        return await self._inflight.do(request_key(params, precision=6), lambda: self._fetch(params))
+
+    async def _fetch(self, params):
+        instrumentation = self.instrumentation
+        async with self._slots:
+            try:
+                with instrumentation.stage("network"):
+                    status, _, body = await self.transport.get(self.base_url, params=params)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, TransportError) as e:
+                instrumentation.count("weatherapi_request_errors_total", error=type(e).__name__)
+                print(f"Error making API request: {e}")
+                return None
+        instrumentation.count("weatherapi_responses_total", status=status)
+        instrumentation.observe("weatherapi_response_bytes", len(body))
+
+        if status != 200:
+            print(f"Request failed with status code: {status}")
+            if body:
+                print(f"Response: {body.decode('utf-8', 'replace')}")
+            return None
+
+        try:
+            with instrumentation.stage("decode"):
+                data = decode_response(body, params)
+        except (ValueError, IndexError) as e:
+            print(f"Error parsing response: {e}")
+            print(f"Response text: {body[:100]!r}...")
+            return None
+
+        if not data:
+            print("Empty response from API")
+            return None
+        return data
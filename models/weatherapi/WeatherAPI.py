@@ -1,40 +1,328 @@
-import requests
-import json
+import threading
+import time
 from typing import Dict, List, Union, Optional, Any
-from constants import BASE_URL
-from request import build_forecast_request
-from response import process_forecast_response
+from urllib.parse import quote
+from .constants import BASE_URL, MAX_URL_LENGTH, MAX_LOCATIONS_PER_REQUEST
+from .request import build_forecast_request, ForecastRequestTemplate
+from .response import decode_response, process_forecast_response, split_forecast_response
+from . import transport as http
+from .transport import HTTPTransport
+from .cache import request_key
+from .singleflight import SingleFlight
+from .stream import iter_json_values, sections_as_arrays
+from .instrumentation import NULL_INSTRUMENTATION
+from .grid import dedupe_locations, grid_resolution
+from .scheduler import BULK, INTERACTIVE, RETRY_STATUSES, request_cost
+
+# Sentinel for the end of a streamed response
+_END = object()
 
 class WeatherAPI:
-    def get_forecast(self, latitude, longitude, **kwargs):
-        params = build_forecast_request(latitude, longitude, **kwargs)
-        response = self._make_request(params)
-        return process_forecast_response(response)
+    def __init__(self, transport=None, base_url=BASE_URL, cache=None, instrumentation=None, scheduler=None):
+        self.transport = transport or HTTPTransport()
+        self.base_url = base_url
+        self.cache = cache
+        # Optional RequestScheduler: rate limiting, priorities and retries
+        self.scheduler = scheduler
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self._inflight = SingleFlight()
+        self.dedupe_stats = {"requested": 0, "fetched": 0}
+        self._dedupe_lock = threading.Lock()
+        self._dedupe_warned = False
+
+    def close(self):
+        self.transport.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def get_forecast(self, latitude, longitude, template=None, **kwargs):
+        """
+        Fetch one forecast. With a ForecastRequestTemplate only `timezone` and
+        `elevation` may be passed; otherwise kwargs go to build_forecast_request.
+        """
+        with self.instrumentation.stage("build"):
+            if template is not None:
+                params = template.params(latitude, longitude, **kwargs)
+            else:
+                params = build_forecast_request(latitude, longitude, **kwargs)
+        response = self._make_request(params, INTERACTIVE)
+        with self.instrumentation.stage("validate"):
+            return process_forecast_response(response)
+
+    def get_model_forecasts(self, latitude, longitude, models, max_models_per_request=None, **kwargs):
+        """
+        Fetch one location's forecast from several weather models.
+
+        All models go in one request by default, which the API answers with a
+        "<variable>_<model>" series per model. With max_models_per_request the
+        models are split into groups fetched concurrently. Returns a list of
+        (group models, response) pairs for ModelEnsemble.from_responses; groups
+        whose request failed are left out.
+        """
+        models = list(models)
+        size = max_models_per_request or len(models) or 1
+        groups = [models[i:i + size] for i in range(0, len(models), size)]
+
+        def fetch(group):
+            return self.get_forecast(latitude, longitude, models=group, **kwargs)
+
+        if len(groups) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                responses = list(executor.map(fetch, groups))
+        else:
+            responses = [fetch(group) for group in groups]
+        return [(group, response) for group, response in zip(groups, responses) if response]
+
+    def get_forecasts(self, locations, template=None, dedupe=False, **kwargs):
+        """
+        Fetch forecasts for many locations using as few multi-location requests as possible.
+
+        The request shape is either a prebuilt ForecastRequestTemplate or the
+        build_forecast_request keyword arguments, compiled into one here. Each
+        location uses its own timezone unless the template fixes one. Results are
+        returned in the same order as `locations`, with None for failed lookups.
+
+        With dedupe=True, locations in the same grid cell of the requested models
+        (and the same timezone) are fetched once at the cell's grid point and share
+        one result object. This only happens with cell_selection="nearest" and
+        models on one regular lat/lng grid, where it doesn't change results;
+        otherwise a warning is printed and every location is fetched as given.
+        """
+        locations = list(locations)
+        template = template or ForecastRequestTemplate(**kwargs)
+
+        if dedupe:
+            unique, index = self.dedupe_locations(locations, template)
+            results = self.get_forecasts(unique, template=template)
+            return [results[i] for i in index]
+
+        results = []
+
+        for chunk in self._chunk_locations(locations, template):
+            with self.instrumentation.stage("build"):
+                params = self._chunk_params(chunk, template)
+            response = self._make_request(params)
+            with self.instrumentation.stage("validate"):
+                results.extend(split_forecast_response(response, len(chunk)))
+
+        return results
+
+    def dedupe_locations(self, locations, template):
+        """
+        Collapse locations sharing a grid cell of the template's models (and a
+        timezone) into one GridPoint each, recording the dedupe counters.
+        Returns (unique, index) as grid.dedupe_locations does. When snapping could
+        change results (see grid.grid_resolution) every location is kept as is.
+        """
+        locations = list(locations)
+        options = template.options
+        resolution = grid_resolution(options.get("models"), options.get("cell_selection", "land"))
+        if resolution is None:
+            if not self._dedupe_warned:
+                self._dedupe_warned = True
+                print("Warning: grid dedupe needs cell_selection='nearest' and models on one regular "
+                      "lat/lng grid; fetching every location individually.")
+            unique, index = locations, list(range(len(locations)))
+        else:
+            unique, index = dedupe_locations(locations, resolution)
+        self.instrumentation.count("weatherapi_dedupe_locations_total", len(locations), kind="requested")
+        self.instrumentation.count("weatherapi_dedupe_locations_total", len(unique), kind="fetched")
+        with self._dedupe_lock:
+            self.dedupe_stats["requested"] += len(locations)
+            self.dedupe_stats["fetched"] += len(unique)
+        return unique, index
+
+    def stream_forecasts(self, locations, arrays=False, chunk_size=65536, template=None, **kwargs):
+        """
+        Like get_forecasts, but parse each response incrementally and yield
+        (location, result) pairs as each location's data arrives, so only one
+        location is held in memory at a time. With arrays=True the hourly/daily
+        lists are converted to NumPy arrays before being yielded. Locations whose
+        request or decoding failed are yielded with None, as in get_forecasts.
+        """
+        locations = list(locations)
+        template = template or ForecastRequestTemplate(**kwargs)
+        instrumentation = self.instrumentation
+
+        for chunk in self._chunk_locations(locations, template):
+            with instrumentation.stage("build"):
+                params = self._chunk_params(chunk, template)
+
+            # A broken stream can't be resumed: the rest of the chunk gets None
+            count = 0
+            try:
+                for location, result in zip(chunk, self._stream_request(params, chunk_size)):
+                    with instrumentation.stage("validate"):
+                        try:
+                            result = process_forecast_response(result)
+                            if arrays and result is not None:
+                                sections_as_arrays(result)
+                        except (ValueError, IndexError) as e:
+                            print(f"Error parsing response: {e}")
+                            result = None
+                    count += 1
+                    yield location, result
+            except http.RequestException as e:
+                instrumentation.count("weatherapi_request_errors_total", error=type(e).__name__)
+                print(f"Error making API request: {e}")
+            except (ValueError, IndexError) as e:
+                print(f"Error parsing response: {e}")
+
+            for location in chunk[count:]:
+                yield location, None
+
+    @staticmethod
+    def _chunk_params(chunk, template):
+        return template.params(
+            [location.lat for location in chunk],
+            [location.lng for location in chunk],
+            timezone=None if template.timezone else [location.timezone for location in chunk],
+        )
+
+    def _stream_request(self, params, chunk_size):
+        """Yield each location's decoded data as it arrives; "decode" times reading and parsing it."""
+        instrumentation = self.instrumentation
+        with self._send(params, BULK, stream=True) as response:
+            instrumentation.count("weatherapi_responses_total", status=response.status_code)
+            if response.status_code != 200:
+                print(f"Request failed with status code: {response.status_code}")
+                if response.content:
+                    print(f"Response: {response.text}")
+                return
+
+            received = 0
+
+            def counted(chunks):
+                nonlocal received
+                for chunk in chunks:
+                    received += len(chunk)
+                    yield chunk
+
+            chunks = counted(response.iter_content(chunk_size=chunk_size))
+            if params.get("format") == "flatbuffers":
+                from .flatbuffer_response import iter_flatbuffers
+                values = iter_flatbuffers(chunks, params)
+            else:
+                values = iter_json_values(chunks)
+
+            try:
+                while True:
+                    with instrumentation.stage("decode"):
+                        value = next(values, _END)
+                    if value is _END:
+                        break
+                    yield value
+            finally:
+                instrumentation.observe("weatherapi_response_bytes", received)
+
+    def _chunk_locations(self, locations, template):
+        """Yield slices of locations whose requests fit within the URL length limit."""
+        base_length = (len(self.base_url) + 1 + len(template.static_query)
+                       + len("latitude=&longitude=&timezone=&"))
+        if template.timezone:
+            base_length += len(quote(template.timezone, safe=""))
+        comma = len(quote(","))
+
+        start, length = 0, base_length
+        for i, location in enumerate(locations):
+            cost = len(str(location.lat)) + len(str(location.lng)) + 2 * comma
+            if not template.timezone:
+                cost += len(quote(location.timezone, safe="")) + comma
+
+            full = i - start >= MAX_LOCATIONS_PER_REQUEST or length + cost > MAX_URL_LENGTH
+            if full and i > start:
+                yield locations[start:i]
+                start, length = i, base_length
+            length += cost
+
+        if start < len(locations):
+            yield locations[start:]
     
-    def _make_request(self, params):
+    def _make_request(self, params, priority=BULK):
+        # Concurrent identical requests share one upstream fetch
+        key = self.cache.key(params) if self.cache is not None else request_key(params, precision=6)
+        return self._inflight.do(key, lambda: self._cached_fetch(key, params, priority))
+
+    def _cached_fetch(self, key, params, priority):
+        if self.cache is None:
+            return self._fetch(params, priority)[0]
+
+        data, outcome = self.cache.lookup(key, decode=lambda body: decode_response(body, params))
+        self.instrumentation.count("weatherapi_cache_total", outcome=outcome)
+        if data is None:
+            data, body = self._fetch(params, priority)
+            if data is not None:
+                self.cache.set(key, data, body, self.cache.ttl(params))
+        return data
+
+    def _send(self, params, priority, stream=False):
+        """
+        GET the request, first waiting for the scheduler's budget. With a scheduler,
+        connection errors, timeouts and retryable statuses are retried with backoff;
+        the last response is returned or the last exception raised.
+        """
+        scheduler = self.scheduler
+        attempt = 0
+        while True:
+            if scheduler is not None:
+                with self.instrumentation.stage("throttle"):
+                    scheduler.acquire(request_cost(params), priority)
+            try:
+                with self.instrumentation.stage("network"):
+                    response = self.transport.get(self.base_url, params=params, stream=stream)
+            except (http.ConnectionError, http.Timeout) as e:
+                if scheduler is None:
+                    raise
+                reason, retry_after, error = type(e).__name__, None, e
+            else:
+                if scheduler is None or response.status_code not in RETRY_STATUSES:
+                    return response
+                reason, retry_after, error = str(response.status_code), response.headers.get("Retry-After"), None
+
+            delay = scheduler.backoff(attempt, retry_after, throttled=reason == "429")
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            if error is None:
+                response.close()
+            self.instrumentation.count("weatherapi_retries_total", reason=reason)
+            time.sleep(delay)
+            attempt += 1
+
+    def _fetch(self, params, priority=BULK):
+        """Return (decoded data, raw body), or (None, None) if the request failed."""
+        instrumentation = self.instrumentation
         try:
-            response = requests.get(BASE_URL, params=params)
+            response = self._send(params, priority)
+            body = response.content
+            instrumentation.count("weatherapi_responses_total", status=response.status_code)
+            instrumentation.observe("weatherapi_response_bytes", len(body))
+
             if response.status_code == 200:
                 try:
-                    data = json.loads(response.text)
+                    with instrumentation.stage("decode"):
+                        data = decode_response(body, params)
                     
                     if not data:
                         print("Empty response from API")
-                        return None
+                        return None, None
 
-                    return data
-                except json.JSONDecodeError as e:
-                    print(f"Error parsing JSON response: {e}")
-                    print(f"Response text: {response.text[:100]}...")
-                    return None
+                    return data, body
+                except (ValueError, IndexError) as e:
+                    print(f"Error parsing response: {e}")
+                    print(f"Response text: {body[:100]!r}...")
+                    return None, None
                 
             else:
                 print(f"Request failed with status code: {response.status_code}")
-                if response.text:
+                if body:
                     print(f"Response: {response.text}")
-                return None
+                return None, None
             
-        except requests.RequestException as e:
+        except http.RequestException as e:
+            instrumentation.count("weatherapi_request_errors_total", error=type(e).__name__)
             print(f"Error making API request: {e}")
-            return None
-        
\ No newline at end of file
+            return None, None
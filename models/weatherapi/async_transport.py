@@ -0,0 +1,138 @@
+"""Minimal keep-alive HTTP/1.1 client on asyncio streams for the Open-Meteo API."""
+
+import asyncio
+import ssl
+import zlib
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+class TransportError(Exception):
+    """The server's response could not be read: malformed framing or a corrupt compressed body."""
+
+class AsyncHTTPTransport:
+    """
+    Pooled asyncio HTTP/1.1 client.
+
+    Idle keep-alive connections are kept per (scheme, host, port) and reused
+    by later requests; at most `max_idle` idle connections are kept per host.
+    Only GET with gzip/deflate bodies is supported, which is all the forecast
+    API needs.
+    """
+
+    def __init__(self,
+                 max_idle: int = 100,
+                 connect_timeout: float = 5.0,
+                 read_timeout: float = 30.0,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.max_idle = max_idle
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._ssl = ssl_context
+        self._idle = {}
+
+    async def get(self, url: str, params=None) -> Tuple[int, Dict[str, str], bytes]:
+        """Return (status, headers, body) with the body decompressed but not decoded."""
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        host = parts.hostname
+        port = parts.port or (443 if secure else 80)
+        key = (parts.scheme, host, port)
+
+        target = parts.path or "/"
+        query = getattr(params, "query", None)
+        if query is None:
+            query = urlencode(params) if isinstance(params, dict) else params
+        if query:
+            target = f"{target}?{query}"
+        request = (f"GET {target} HTTP/1.1\r\n"
+                   f"Host: {parts.netloc}\r\n"
+                   "Accept: application/json\r\n"
+                   "Accept-Encoding: gzip, deflate\r\n"
+                   "Connection: keep-alive\r\n\r\n").encode("latin-1")
+
+        idle = self._idle.setdefault(key, [])
+        while idle:
+            reader, writer = idle.pop()
+            try:
+                return await self._exchange(key, reader, writer, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed the idle connection; fall through to a new one
+                writer.close()
+
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl_context() if secure else None),
+            self.connect_timeout)
+        return await self._exchange(key, reader, writer, request)
+
+    def _ssl_context(self):
+        # Loading the CA certificates is slow, so one context is built on first use and shared
+        if self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        return self._ssl
+
+    async def _exchange(self, key, reader, writer, request):
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, headers, body = await asyncio.wait_for(self._read_response(reader), self.read_timeout)
+        except BaseException:
+            writer.close()
+            raise
+
+        if headers.get("connection", "").lower() == "close" or len(self._idle[key]) >= self.max_idle:
+            writer.close()
+        else:
+            self._idle[key].append((reader, writer))
+
+        encoding = headers.get("content-encoding", "").lower()
+        try:
+            if encoding == "gzip":
+                body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+            elif encoding == "deflate":
+                body = zlib.decompress(body)
+        except zlib.error as e:
+            raise TransportError(f"Corrupt {encoding} response body: {e}") from e
+        return status, headers, body
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed before response")
+        try:
+            return await self._read_message(reader, status_line)
+        except (ValueError, IndexError) as e:
+            raise TransportError(f"Malformed response: {e}") from e
+
+    async def _read_message(self, reader, status_line):
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, body
+
+    async def close(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
@@ -0,0 +1,146 @@
+"""Two-tier (memory LRU + sqlite) cache for forecast responses."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+from .constants import SECTION_TTLS, MODEL_UPDATE_INTERVALS, DEFAULT_MODEL_UPDATE_INTERVAL
+
+COORDINATE_PARAMS = ("latitude", "longitude")
+
+def request_key(params: Dict, precision: int = 3) -> str:
+    """Normalize request params into a cache key: sorted params, coordinates rounded to `precision` places."""
+    normalized = dict(params)
+    for name in COORDINATE_PARAMS:
+        if name in normalized:
+            values = str(normalized[name]).split(",")
+            normalized[name] = ",".join(f"{float(v):.{precision}f}" for v in values if v != "")
+    return urlencode(sorted((k, str(v)) for k, v in normalized.items()))
+
+def request_ttl(params: Dict) -> int:
+    """Seconds a response stays fresh: the shortest requested section, capped by the fastest-updating model."""
+    sections = [ttl for section, ttl in SECTION_TTLS.items() if params.get(section)]
+    ttl = min(sections) if sections else DEFAULT_MODEL_UPDATE_INTERVAL
+
+    models = params.get("models")
+    if models:
+        intervals = [MODEL_UPDATE_INTERVALS.get(m, DEFAULT_MODEL_UPDATE_INTERVAL) for m in models.split(",")]
+    else:
+        intervals = [DEFAULT_MODEL_UPDATE_INTERVAL]
+    return min(ttl, min(intervals))
+
+class ForecastCache:
+    """
+    In-memory LRU of decoded responses backed by an optional on-disk tier.
+
+    The disk tier stores the raw response body in sqlite so it survives
+    restarts; disk hits are decoded and promoted into memory. The disk tier
+    is one sqlite connection behind its own lock, which is never held while
+    taking the LRU lock (or the reverse), so a slow disk read or decode never
+    blocks other threads' memory hits.
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None, precision: int = 3):
+        self.max_entries = max_entries
+        self.precision = precision
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._db = None
+        if path:
+            import sqlite3
+
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS forecast_cache "
+                             "(key TEXT PRIMARY KEY, expires REAL, body BLOB)")
+            self._db.commit()
+
+    def _disk(self, sql, args=(), fetch=False):
+        """Run one statement on the disk tier under the disk lock; None without one."""
+        with self._disk_lock:
+            if self._db is None:
+                return None
+            cursor = self._db.execute(sql, args)
+            if fetch:
+                return cursor.fetchone()
+            self._db.commit()
+            return None
+
+    def key(self, params: Dict) -> str:
+        return request_key(params, self.precision)
+
+    def ttl(self, params: Dict) -> int:
+        return request_ttl(params)
+
+    def get(self, key: str, decode=json.loads):
+        return self.lookup(key, decode)[0]
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def lookup(self, key: str, decode=json.loads):
+        """Return (data, outcome) where outcome is "memory_hit", "disk_hit" or "miss"."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, data = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return data, "memory_hit"
+                del self._memory[key]
+                self.stats["expired"] += 1
+
+        if self._db is not None:
+            row = self._disk("SELECT expires, body FROM forecast_cache WHERE key = ?", (key,), fetch=True)
+            if row is not None:
+                expires, body = row
+                if expires > now:
+                    data = decode(body)
+                    with self._lock:
+                        # Another thread may have stored a newer response while we read
+                        current = self._memory.get(key)
+                        if current is None or current[0] < expires:
+                            self._remember(key, expires, data)
+                        self.stats["disk_hits"] += 1
+                    return data, "disk_hit"
+                self._disk("DELETE FROM forecast_cache WHERE key = ? AND expires <= ?", (key, now))
+                self._count("expired")
+
+        self._count("misses")
+        return None, "miss"
+
+    def set(self, key: str, data, body: Optional[bytes], ttl: int):
+        expires = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires, data)
+        if self._db is not None and body is not None:
+            self._disk("INSERT OR REPLACE INTO forecast_cache (key, expires, body) VALUES (?, ?, ?)",
+                       (key, expires, body))
+
+    def _remember(self, key, expires, data):
+        self._memory[key] = (expires, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (expires, _) in self._memory.items() if expires <= now]:
+                del self._memory[key]
+        if self._db is not None:
+            self._disk("DELETE FROM forecast_cache WHERE expires <= ?", (now,))
+
+    def close(self):
+        with self._disk_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -9,79 +9,8 @@ UNITS = {
     "timeformat": ["iso8601", "unixtime"]
 }
 
-# All available hourly variables
-HOURLY_VARIABLES = [
-    # Temperature and Humidity
-    "temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature",
-    
-    # Pressure
-    "pressure_msl", "surface_pressure",
-    
-    # Clouds
-    "cloud_cover", "cloud_cover_low", "cloud_cover_mid", "cloud_cover_high",
-    
-    # Wind
-    "wind_speed_10m", "wind_speed_80m", "wind_speed_120m", "wind_speed_180m",
-    "wind_direction_10m", "wind_direction_80m", "wind_direction_120m", "wind_direction_180m",
-    "wind_gusts_10m",
-    
-    # Solar Radiation
-    "shortwave_radiation", "direct_radiation", "direct_normal_irradiance", 
-    "diffuse_radiation", "global_tilted_irradiance",
-    
-    # Other atmospheric
-    "vapour_pressure_deficit", "cape", "evapotranspiration", "et0_fao_evapotranspiration",
-    
-    # Precipitation
-    "precipitation", "snowfall", "precipitation_probability", "rain", "showers",
-    
-    # Conditions
-    "weather_code", "snow_depth", "freezing_level_height", "visibility", "is_day",
-    
-    # Soil
-    "soil_temperature_0cm", "soil_temperature_6cm", "soil_temperature_18cm", "soil_temperature_54cm",
-    "soil_moisture_0_to_1cm", "soil_moisture_1_to_3cm", "soil_moisture_3_to_9cm", 
-    "soil_moisture_9_to_27cm", "soil_moisture_27_to_81cm"
-]
-
-# All available daily variables
-DAILY_VARIABLES = [
-    "weather_code", 
-    "temperature_2m_max", "temperature_2m_min",
-    "apparent_temperature_max", "apparent_temperature_min",
-    "sunrise", "sunset", "daylight_duration", "sunshine_duration",
-    "uv_index_max", "uv_index_clear_sky_max",
-    "precipitation_sum", "rain_sum", "showers_sum", "snowfall_sum",
-    "precipitation_hours", "precipitation_probability_max", "precipitation_probability_min", 
-    "precipitation_probability_mean",
-    "wind_speed_10m_max", "wind_gusts_10m_max", "wind_direction_10m_dominant",
-    "shortwave_radiation_sum", "et0_fao_evapotranspiration"
-]
-
-# All available current variables
-CURRENT_VARIABLES = [
-    "temperature_2m", "relative_humidity_2m", "apparent_temperature", "is_day",
-    "precipitation", "rain", "showers", "snowfall", "weather_code",
-    "cloud_cover", "pressure_msl", "surface_pressure",
-    "wind_speed_10m", "wind_direction_10m", "wind_gusts_10m"
-]
-
-# All available 15-minutely variables
-MINUTELY_15_VARIABLES = [
-    "temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature",
-    "precipitation", "rain", "showers", "snowfall", "snowfall_height",
-    "freezing_level_height", "cape", "wind_speed_10m", "wind_speed_80m",
-    "wind_direction_10m", "wind_direction_80m", "wind_gusts_10m",
-    "shortwave_radiation", "direct_radiation", "direct_normal_irradiance",
-    "diffuse_radiation", "global_tilted_irradiance", "global_tilted_irradiance_instant",
-    "sunshine_duration", "lightning_potential", "visibility", "weather_code"
-]
-
-# Pressure level variables (for each pressure level)
-PRESSURE_LEVEL_VARIABLES = [
-    "temperature", "relative_humidity", "dew_point", 
-    "cloud_cover", "wind_speed", "wind_direction", "geopotential_height"
-]
+# Response body formats
+RESPONSE_FORMATS = ["json", "flatbuffers"]
 
 # Available pressure levels in hPa
 PRESSURE_LEVELS = [
@@ -89,16 +18,56 @@ PRESSURE_LEVELS = [
     400, 300, 250, 200, 150, 100, 70, 50, 30
 ]
 
-# Weather models
-WEATHER_MODELS = [
-    "best_match", "icon_seamless", "icon_global", "icon_eu", "icon_d2",
-    "gfs_seamless", "gfs_global", "gfs_hrrr", "gfs_hrrr_alaska",
-    "ecmwf_seamless", "ecmwf_ifs", "ecmwf_aifs",
-    "metno_nordic", "harmonie_knmi", "gem_seamless", "gem_global", "gem_regional", "gem_hrdps",
-    "meteofrance_seamless", "meteofrance_arpege", "meteofrance_arome",
-    "jma_seamless", "jma_msm", "jma_gsm", "cma_grapes_global", "ukmo_global", "bom_access_global",
-    "era5", "era5_land", "cerra", "cerra_land", "optionally_ensemble"
-]
-
 # Cell selection options
-CELL_SELECTIONS = ["land", "sea", "nearest"]
\ No newline at end of file
+CELL_SELECTIONS = ["land", "sea", "nearest"]
+
+# Request size limits for multi-location requests
+MAX_URL_LENGTH = 8000
+MAX_LOCATIONS_PER_REQUEST = 1000
+
+# Default API call budget as {period seconds: calls}, matching Open-Meteo's free tier
+RATE_LIMITS = {60: 600, 3600: 5000, 86400: 10000}
+
+# Cache lifetimes (seconds) for each data section; shorter sections win
+SECTION_TTLS = {
+    "current": 900,
+    "minutely_15": 900,
+    "hourly": 3600,
+    "daily": 21600,
+}
+
+# How often each model publishes a new run (seconds); unlisted models use DEFAULT_MODEL_UPDATE_INTERVAL
+MODEL_UPDATE_INTERVALS = {
+    "gfs_hrrr": 3600, "gfs_hrrr_alaska": 3600,
+    "icon_d2": 10800, "icon_eu": 10800, "icon_global": 21600, "icon_seamless": 10800,
+    "gfs_global": 21600, "gfs_seamless": 3600,
+    "ecmwf_ifs": 21600, "ecmwf_aifs": 21600, "ecmwf_seamless": 21600,
+    "metno_nordic": 3600, "harmonie_knmi": 3600,
+    "gem_global": 43200, "gem_regional": 21600, "gem_hrdps": 21600, "gem_seamless": 21600,
+    "meteofrance_arpege": 21600, "meteofrance_arome": 3600, "meteofrance_seamless": 3600,
+    "jma_gsm": 21600, "jma_msm": 10800, "jma_seamless": 10800,
+    "cma_grapes_global": 21600, "ukmo_global": 21600, "bom_access_global": 21600,
+    "era5": 86400, "era5_land": 86400, "cerra": 86400, "cerra_land": 86400,
+}
+DEFAULT_MODEL_UPDATE_INTERVAL = 3600
+
+# Spacing in degrees of models served on a regular lat/lng grid whose points
+# are multiples of the spacing, so snapping a coordinate finds its cell exactly.
+# Projected grids (HRRR, AROME HD, MET Nordic, CERRA...), reduced Gaussian and
+# icosahedral grids, seamless blends and best_match are deliberately absent.
+REGULAR_GRID_RESOLUTIONS = {
+    "icon_d2": 0.02, "icon_eu": 0.0625, "ecmwf_aifs": 0.25, "gem_global": 0.15,
+    "cma_grapes_global": 0.125, "era5": 0.25, "era5_land": 0.1,
+}
+
+# Variable/model name tables live in .variables and are only imported when first used
+_VARIABLE_TABLES = {
+    "HOURLY_VARIABLES", "DAILY_VARIABLES", "CURRENT_VARIABLES", "MINUTELY_15_VARIABLES",
+    "PRESSURE_LEVEL_VARIABLES", "WEATHER_MODELS",
+}
+
+def __getattr__(name):
+    if name in _VARIABLE_TABLES:
+        from . import variables
+        return getattr(variables, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
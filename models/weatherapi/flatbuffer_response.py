@@ -0,0 +1,100 @@
+"""Decoding of Open-Meteo FlatBuffers responses into the same shape as the JSON path."""
+
+from typing import Dict, Iterable, Iterator, List, Union
+
+import numpy as np
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+SECTIONS = ("current", "minutely_15", "hourly", "daily")
+
+# Variables the API sends as int64 unixtime instead of float32
+INT64_VARIABLES = {"sunrise", "sunset"}
+
+def _values(variable, name):
+    values = variable.ValuesInt64AsNumpy() if name in INT64_VARIABLES else variable.ValuesAsNumpy()
+    # Generated accessors return 0 rather than an empty array when the vector is absent
+    if isinstance(values, int):
+        return np.empty(0, dtype=np.int64 if name in INT64_VARIABLES else np.float32)
+    return values
+
+def _section(block, names: List[str], current: bool = False) -> Dict:
+    count = min(block.VariablesLength(), len(names))
+    if count != len(names):
+        print(f"Warning: expected {len(names)} variables, response has {block.VariablesLength()}")
+
+    if current:
+        result = {"time": block.Time(), "interval": block.Interval()}
+        for i in range(count):
+            variable = block.Variables(i)
+            result[names[i]] = variable.ValuesInt64(0) if names[i] in INT64_VARIABLES else variable.Value()
+        return result
+
+    result = {"time": np.arange(block.Time(), block.TimeEnd(), block.Interval(), dtype=np.int64)}
+    for i in range(count):
+        result[names[i]] = _values(block.Variables(i), names[i])
+    return result
+
+def _message_to_dict(message, requested: Dict[str, List[str]]) -> Dict:
+    timezone = message.Timezone()
+    abbreviation = message.TimezoneAbbreviation()
+    result = {
+        "latitude": message.Latitude(),
+        "longitude": message.Longitude(),
+        "elevation": message.Elevation(),
+        "generationtime_ms": message.GenerationTimeMilliseconds(),
+        "utc_offset_seconds": message.UtcOffsetSeconds(),
+        "timezone": timezone.decode() if timezone else None,
+        "timezone_abbreviation": abbreviation.decode() if abbreviation else None,
+    }
+
+    blocks = {
+        "current": message.Current(),
+        "minutely_15": message.Minutely15(),
+        "hourly": message.Hourly(),
+        "daily": message.Daily(),
+    }
+    for section, names in requested.items():
+        block = blocks[section]
+        if block is not None:
+            result[section] = _section(block, names, current=section == "current")
+    return result
+
+def _requested(params: Dict) -> Dict[str, List[str]]:
+    return {section: params[section].split(",") for section in SECTIONS if params.get(section)}
+
+def iter_flatbuffers(chunks: Iterable[bytes], params: Dict) -> Iterator[Dict]:
+    """Decode length-prefixed messages from a streamed body, yielding each location as it completes."""
+    requested = _requested(params)
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        while len(buf) >= 4:
+            length = int.from_bytes(buf[:4], "little")
+            if len(buf) < length + 4:
+                break
+            message = bytes(buf[4:length + 4])
+            del buf[:length + 4]
+            yield _message_to_dict(WeatherApiResponse.GetRootAs(message, 0), requested)
+
+def decode_flatbuffers(body: bytes, params: Dict) -> Union[Dict, List[Dict], None]:
+    """
+    Decode a FlatBuffers response body.
+
+    Variables are matched to names by position, in the order they were
+    requested in `params`. Arrays are views over `body`, not copies.
+    Returns a dict for a single location and a list for several, mirroring
+    the JSON API.
+    """
+    requested = _requested(params)
+
+    results = []
+    pos = 0
+    while pos + 4 <= len(body):
+        length = int.from_bytes(body[pos:pos + 4], "little")
+        message = WeatherApiResponse.GetRootAs(body, pos + 4)
+        results.append(_message_to_dict(message, requested))
+        pos += length + 4
+
+    if not results:
+        return None
+    return results[0] if len(results) == 1 else results
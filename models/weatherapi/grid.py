@@ -0,0 +1,61 @@
+"""
+Grid-cell deduplication for multi-location requests.
+Coordinates are snapped to the nearest grid point of the requested models, so
+locations that share a model cell (and timezone) become one upstream location.
+This only gives the same answer as per-location requests with
+cell_selection="nearest" on a regular lat/lng grid; grid_resolution() returns
+None for every other request shape.
+"""
+
+from typing import List, NamedTuple, Optional, Tuple
+
+from .constants import REGULAR_GRID_RESOLUTIONS
+
+
+class GridPoint(NamedTuple):
+    """Stand-in for a Location when requesting one grid cell."""
+    lat: float
+    lng: float
+    timezone: str
+
+
+def grid_resolution(models: Optional[List[str]] = None, cell_selection: Optional[str] = None) -> Optional[float]:
+    """
+    Grid spacing in degrees to dedupe on, or None if deduping could change results:
+    cell_selection other than "nearest" (land/sea picks a cell per location),
+    no models (best_match), a model without a known regular grid, or models on
+    different grids (a fine cell can straddle two coarse ones).
+    """
+    if cell_selection != "nearest" or not models:
+        return None
+    resolutions = {REGULAR_GRID_RESOLUTIONS.get(model) for model in models}
+    if len(resolutions) != 1 or None in resolutions:
+        return None
+    return resolutions.pop()
+
+
+def snap(lat: float, lng: float, resolution: float) -> Tuple[float, float]:
+    """Nearest grid point to (lat, lng), rounded so equal cells compare equal."""
+    return (round(round(lat / resolution) * resolution, 6),
+            round(round(lng / resolution) * resolution, 6))
+
+
+def dedupe_locations(locations, resolution: float):
+    """
+    Group locations by grid point and timezone.
+
+    Returns (unique, index): one GridPoint per group, and for every input
+    location the position of its group in `unique`. Fan results back out
+    with [results[i] for i in index].
+    """
+    groups = {}
+    unique = []
+    index = []
+    for location in locations:
+        point = GridPoint(*snap(location.lat, location.lng, resolution), location.timezone)
+        position = groups.get(point)
+        if position is None:
+            position = groups[point] = len(unique)
+            unique.append(point)
+        index.append(position)
+    return unique, index
@@ -4,7 +4,17 @@ builds all the request parameters needed to make a successful call to the Open-M
 '''
 
 from typing import Dict, List, Union, Optional
-from .constants import UNITS, CELL_SELECTIONS, PRESSURE_LEVELS, WEATHER_MODELS
+from urllib.parse import quote_plus, urlencode
+from .constants import UNITS, CELL_SELECTIONS, PRESSURE_LEVELS, RESPONSE_FORMATS
+
+# Set views of the option tables for O(1) membership checks
+_UNITS = {name: frozenset(values) for name, values in UNITS.items()}
+_CELL_SELECTIONS = frozenset(CELL_SELECTIONS)
+_PRESSURE_LEVELS = frozenset(PRESSURE_LEVELS)
+_RESPONSE_FORMATS = frozenset(RESPONSE_FORMATS)
+
+# Parameters filled in per location by ForecastRequestTemplate
+LOCATION_PARAMS = ("latitude", "longitude", "elevation", "timezone")
 
 def build_forecast_request(
                          latitude: Union[float, List[float]], 
@@ -36,7 +46,8 @@ def build_forecast_request(
                          apikey: Optional[str] = None,
                          pressure_level: Optional[List[int]] = None,
                          tilt: Optional[float] = None,
-                         azimuth: Optional[float] = None) -> Dict:
+                         azimuth: Optional[float] = None,
+                         format: str = "json") -> Dict:
     
     params = {}
     
@@ -67,16 +78,16 @@ def build_forecast_request(
     if minutely_15:
         params["minutely_15"] = ",".join(minutely_15)
     
-    if temperature_unit and temperature_unit in UNITS["temperature"]:
+    if temperature_unit and temperature_unit in _UNITS["temperature"]:
         params["temperature_unit"] = temperature_unit
         
-    if wind_speed_unit and wind_speed_unit in UNITS["wind_speed"]:
+    if wind_speed_unit and wind_speed_unit in _UNITS["wind_speed"]:
         params["wind_speed_unit"] = wind_speed_unit
         
-    if precipitation_unit and precipitation_unit in UNITS["precipitation"]:
+    if precipitation_unit and precipitation_unit in _UNITS["precipitation"]:
         params["precipitation_unit"] = precipitation_unit
         
-    if timeformat and timeformat in UNITS["timeformat"]:
+    if timeformat and timeformat in _UNITS["timeformat"]:
         params["timeformat"] = timeformat
     
     if timezone:
@@ -124,14 +135,14 @@ def build_forecast_request(
     if models:
         params["models"] = ",".join(models)
     
-    if cell_selection in CELL_SELECTIONS:
+    if cell_selection in _CELL_SELECTIONS:
         params["cell_selection"] = cell_selection
     
     if apikey:
         params["apikey"] = apikey
     
     if pressure_level:
-        valid_levels = [level for level in pressure_level if level in PRESSURE_LEVELS]
+        valid_levels = [level for level in pressure_level if level in _PRESSURE_LEVELS]
         if valid_levels:
             params["pressure_level"] = ",".join(str(level) for level in valid_levels)
     
@@ -140,5 +151,122 @@ def build_forecast_request(
         
     if azimuth is not None:
         params["azimuth"] = azimuth
+
+    if format != "json" and format in _RESPONSE_FORMATS:
+        params["format"] = format
     
-    return params
\ No newline at end of file
+    return params
+
+
+class RequestParams(dict):
+    """
+    Request params with their query string already encoded. Transports send
+    `query` as-is instead of re-encoding the dict, so do not mutate it.
+    """
+
+    __slots__ = ("query",)
+
+    def __init__(self, params, query):
+        super().__init__(params)
+        self.query = query
+
+
+def _join(values):
+    if isinstance(values, (list, tuple)):
+        return ",".join(map(str, values))
+    return str(values)
+
+
+class ForecastRequestTemplate:
+    """
+    A forecast request shape validated and encoded once, then stamped out per
+    location. Everything except latitude, longitude, elevation and timezone
+    is fixed when the template is built; unknown variables, models, units or
+    options raise ValueError here rather than as an API error later.
+
+    Takes the same keyword arguments as build_forecast_request. A `timezone`
+    given here applies to every location unless overridden when stamping.
+    """
+
+    def __init__(self, timezone: Optional[str] = None, **kwargs):
+        for name in ("latitude", "longitude", "elevation"):
+            if name in kwargs:
+                raise ValueError(f"{name} is set per location, not on the template")
+        self._validate(**kwargs)
+
+        self.timezone = timezone
+        self.options = dict(kwargs)
+        self.static_params = {name: value
+                              for name, value in build_forecast_request([], [], timezone=None, **kwargs).items()
+                              if name not in LOCATION_PARAMS}
+        self.static_query = urlencode(self.static_params)
+        self._quoted_timezones = {}
+
+    @staticmethod
+    def _validate(hourly=None, daily=None, current=None, minutely_15=None, models=None,
+                  pressure_level=None, temperature_unit="celsius", wind_speed_unit="kmh",
+                  precipitation_unit="mm", timeformat="iso8601", cell_selection="land",
+                  format="json", **_):
+        from .variables import (HOURLY_VARIABLES, DAILY_VARIABLES, CURRENT_VARIABLES,
+                                MINUTELY_15_VARIABLES, PRESSURE_LEVEL_VARIABLES, WEATHER_MODELS)
+
+        hourly_names = set(HOURLY_VARIABLES)
+        hourly_names.update(f"{variable}_{level}hPa"
+                            for variable in PRESSURE_LEVEL_VARIABLES for level in PRESSURE_LEVELS)
+        lists = [("hourly", hourly, hourly_names),
+                 ("daily", daily, DAILY_VARIABLES),
+                 ("current", current, CURRENT_VARIABLES),
+                 ("minutely_15", minutely_15, MINUTELY_15_VARIABLES),
+                 ("models", models, WEATHER_MODELS),
+                 ("pressure_level", pressure_level, _PRESSURE_LEVELS)]
+        for name, values, allowed in lists:
+            unknown = set(values or ()).difference(allowed)
+            if unknown:
+                raise ValueError(f"Unknown {name} value(s): {', '.join(sorted(map(str, unknown)))}")
+
+        options = [("temperature_unit", temperature_unit, _UNITS["temperature"]),
+                   ("wind_speed_unit", wind_speed_unit, _UNITS["wind_speed"]),
+                   ("precipitation_unit", precipitation_unit, _UNITS["precipitation"]),
+                   ("timeformat", timeformat, _UNITS["timeformat"]),
+                   ("cell_selection", cell_selection, _CELL_SELECTIONS),
+                   ("format", format, _RESPONSE_FORMATS)]
+        for name, value, allowed in options:
+            if value not in allowed:
+                raise ValueError(f"Invalid {name}: {value!r} (expected one of {', '.join(sorted(allowed))})")
+
+    def _quote_timezone(self, timezone):
+        quoted = self._quoted_timezones.get(timezone)
+        if quoted is None:
+            quoted = self._quoted_timezones[timezone] = quote_plus(timezone, safe="")
+        return quoted
+
+    def _stamp(self, latitude, longitude, timezone, elevation):
+        if isinstance(latitude, (list, tuple)) and len(latitude) != len(longitude):
+            raise ValueError("Latitude and longitude lists must have the same length")
+        params = {"latitude": _join(latitude), "longitude": _join(longitude)}
+        # str() of a float never needs escaping, so only the list commas are encoded
+        parts = [f"latitude={params['latitude'].replace(',', '%2C')}",
+                 f"longitude={params['longitude'].replace(',', '%2C')}"]
+        if elevation is not None:
+            params["elevation"] = _join(elevation)
+            parts.append(f"elevation={params['elevation'].replace(',', '%2C')}")
+        params.update(self.static_params)
+        if self.static_query:
+            parts.append(self.static_query)
+
+        timezone = timezone or self.timezone or "GMT"
+        if isinstance(timezone, (list, tuple)):
+            params["timezone"] = ",".join(timezone)
+            parts.append("timezone=" + "%2C".join(map(self._quote_timezone, timezone)))
+        else:
+            params["timezone"] = timezone
+            parts.append("timezone=" + self._quote_timezone(timezone))
+        return params, "&".join(parts)
+
+    def query(self, latitude, longitude, timezone=None, elevation=None) -> str:
+        """Encoded query string for one location, or for parallel lists of them."""
+        return self._stamp(latitude, longitude, timezone, elevation)[1]
+
+    def params(self, latitude, longitude, timezone=None, elevation=None) -> RequestParams:
+        """Params for one location (or parallel lists), carrying the pre-encoded query string."""
+        return RequestParams(*self._stamp(latitude, longitude, timezone, elevation))
@@ -1,6 +1,14 @@
 """Functions for processing API responses from Open-Meteo."""
 
-from typing import Dict, Optional, Any
+import json
+from typing import Dict, List, Optional
+
+def decode_response(body: bytes, params: Dict):
+    """Decode a raw response body according to the requested format."""
+    if params.get("format") == "flatbuffers":
+        from .flatbuffer_response import decode_flatbuffers
+        return decode_flatbuffers(body, params)
+    return json.loads(body)
 
 def process_forecast_response(response: Dict) -> Dict:
     if not response:
@@ -22,4 +30,17 @@ def extract_weather_data(response: Dict, data_type: str) -> Dict:
     if not response or data_type not in response:
         return {}
         
-    return response[data_type]
\ No newline at end of file
+    return response[data_type]
+
+def split_forecast_response(response, count: int) -> List[Optional[Dict]]:
+    """Split a multi-location response into one processed result per location."""
+    if isinstance(response, list):
+        if len(response) != count:
+            print(f"Expected {count} locations in response, got {len(response)}")
+            return [None] * count
+        return [process_forecast_response(item) for item in response]
+
+    result = process_forecast_response(response)
+    if count == 1:
+        return [result]
+    return [None] * count
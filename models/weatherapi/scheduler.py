@@ -0,0 +1,191 @@
+"""Rate-limit budget, request priorities and retry policy for the forecast API."""
+
+import heapq
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from .constants import RATE_LIMITS
+
+INTERACTIVE = 0
+BULK = 1
+
+# Responses worth retrying: rate limited, or a transient server-side failure
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Rate limits as "calls/period,..." (e.g. "600/min,5000/hour"), or "off" for keys without a budget
+RATE_LIMIT_ENV = "OPEN_METEO_RATE_LIMIT"
+PERIODS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60,
+           "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+# Waits longer than this are reported, so a run stalled on the budget isn't silent
+LONG_WAIT_SECONDS = 30.0
+
+# Open-Meteo counts a location with more than 10 variables or 2 weeks of data as several calls
+VARIABLES_PER_CALL = 10
+DAYS_PER_CALL = 14
+
+
+def request_cost(params: Dict) -> float:
+    """Number of API calls a request is billed as."""
+    locations = max(1, len(str(params.get("latitude", "")).split(",")))
+    variables = sum(len(str(params[section]).split(","))
+                    for section in ("hourly", "daily", "current", "minutely_15") if params.get(section))
+    days = (params.get("past_days") or 0) + (params.get("forecast_days") or 0)
+    return locations * max(1.0, variables / VARIABLES_PER_CALL) * max(1.0, days / DAYS_PER_CALL)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limits(spec: Optional[str]) -> Optional[Dict[int, int]]:
+    """
+    Limits from a "calls/period" list such as "600/min,5000/hour,10000/day".
+    None or "" means the default RATE_LIMITS; "off" means no limits ({}).
+    Raises ValueError for a malformed spec.
+    """
+    if spec is None or not spec.strip():
+        return dict(RATE_LIMITS)
+    if spec.strip().lower() in ("off", "none", "0"):
+        return {}
+    limits = {}
+    for part in spec.split(","):
+        calls, _, period = part.strip().partition("/")
+        period = period.strip().lower()
+        seconds = PERIODS.get(period) or (int(period) if period.isdigit() else None)
+        if not calls.strip().isdigit() or not seconds:
+            raise ValueError(f"invalid rate limit {part.strip()!r}; expected e.g. 600/min")
+        limits[seconds] = int(calls)
+    return limits
+
+
+def make_scheduler(spec: Optional[str] = None, **kwargs) -> "RequestScheduler":
+    """RequestScheduler with limits from `spec`, or from $OPEN_METEO_RATE_LIMIT when spec is None."""
+    if spec is None:
+        spec = os.environ.get(RATE_LIMIT_ENV)
+    return RequestScheduler(limits=parse_rate_limits(spec), **kwargs)
+
+
+class TokenBucket:
+    """`capacity` tokens refilled evenly over `period` seconds."""
+
+    def __init__(self, capacity: float, period: float, now: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost, now):
+        # A request larger than the whole bucket waits for a full bucket and goes into debt
+        self._refill(now)
+        needed = min(cost, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+    def take(self, cost):
+        self.tokens -= cost
+
+
+class RequestScheduler:
+    """
+    Request budget for one API key, shared by the threads of one process
+    (separate processes each keep their own budget).
+
+    Callers block in acquire() until every token bucket (per minute, hour and
+    day by default) can pay for the request. Waiting requests are served
+    interactive-first, then in arrival order, so a bulk run keeps the quota
+    busy without starving interactive lookups. A 429 pauses everyone for the
+    backoff delay, not just the request that hit it.
+    """
+
+    def __init__(self,
+                 limits: Optional[Dict[int, int]] = None,
+                 max_retries: int = 5,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 60.0,
+                 clock=time.monotonic):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clock = clock
+        now = clock()
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self._buckets = [TokenBucket(capacity, period, now) for period, capacity in self.limits.items()]
+        self._paused_until = now
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, cost: float = 1, priority: int = BULK) -> float:
+        """Block until the request may be sent; returns the seconds spent waiting."""
+        started = self._clock()
+        ticket = (priority, next(self._sequence))
+        reported = False
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            self._condition.notify_all()
+            try:
+                while True:
+                    if self._waiting[0] != ticket:
+                        self._condition.wait()
+                        continue
+                    now = self._clock()
+                    delay = max([self._paused_until - now]
+                                + [bucket.wait_time(cost, now) for bucket in self._buckets])
+                    if delay <= 0:
+                        for bucket in self._buckets:
+                            bucket.take(cost)
+                        return now - started
+                    if not reported and now - started + delay > LONG_WAIT_SECONDS:
+                        reported = True
+                        print(f"Rate limit: waiting {delay:.0f}s for API budget "
+                              f"(limits {self.limits}; set --rate-limit or ${RATE_LIMIT_ENV} to change)",
+                              file=sys.stderr)
+                    # Woken early if a higher-priority request arrives
+                    self._condition.wait(delay)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def pause(self, seconds: float):
+        """Hold every request for `seconds`, e.g. after the server reports the limit was hit."""
+        with self._condition:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            self._condition.notify_all()
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None, throttled: bool = False) -> Optional[float]:
+        """
+        Seconds to sleep before retry number `attempt` (full-jitter exponential
+        backoff, never shorter than the server's Retry-After), or None if the
+        request should not be retried. A throttled (429) response also pauses
+        the whole scheduler.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            delay = max(delay, server_delay)
+        if throttled:
+            self.pause(delay)
+        if attempt >= self.max_retries or delay > self.backoff_max:
+            return None
+        return delay
@@ -0,0 +1,96 @@
+"""Coalesce concurrent identical calls into a single in-flight execution."""
+
+import threading
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Thread-based single-flight group: while a call for `key` is running,
+    other callers with the same key wait for it and share its result
+    (or its exception) instead of running `fn` themselves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart to SingleFlight; must be used from a single event loop.
+
+    The call runs in its own task that every caller awaits through
+    asyncio.shield, so cancelling one caller (including the first) never
+    cancels the others. The task is only cancelled once every caller waiting
+    on it has been cancelled.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, coro_fn):
+        import asyncio
+
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _AsyncCall(asyncio.ensure_future(coro_fn()))
+            call.task.add_done_callback(lambda task: self._finish(key, call, task))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Nobody is left to use the result; later callers start afresh
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _finish(self, key, call, task):
+        self._forget(key, call)
+        # Mark exceptions as retrieved so a call nobody waited for doesn't warn
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,79 @@
+"""Incremental parsing of forecast responses, one location at a time."""
+
+import json
+import re
+from typing import Dict, Iterable, Iterator
+
+STRUCTURAL = re.compile(rb'["\[\]{}]')
+STRING_REST = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+def iter_json_values(chunks: Iterable[bytes]) -> Iterator:
+    """
+    Yield each element of a top-level JSON array of objects as soon as it is
+    complete, or the single value if the document is one top-level object.
+
+    Only the element currently being received is buffered, so peak memory
+    is bounded by the largest element rather than the whole document. Raises
+    ValueError (json.JSONDecodeError for a malformed element) on bad input.
+    """
+    buf = bytearray()
+    pos = 0
+    depth = 0
+    element_depth = None
+    start = None
+
+    for chunk in chunks:
+        buf += chunk
+        while True:
+            match = STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+
+            char = buf[match.start()]
+            if char == 0x22:  # '"'
+                end = STRING_REST.match(buf, match.start() + 1)
+                if end is None:
+                    # String continues in the next chunk; rescan it from the opening quote
+                    pos = match.start()
+                    break
+                pos = end.end()
+                continue
+
+            if char in b"[{":
+                if element_depth is None:
+                    element_depth = 1 if char == 0x5B else 0
+                if depth == element_depth and start is None:
+                    start = match.start()
+                depth += 1
+            else:
+                depth -= 1
+                if depth == element_depth and start is not None:
+                    yield json.loads(buf[start:match.end()])
+                    del buf[:match.end()]
+                    pos = 0
+                    start = None
+                    continue
+            pos = match.end()
+
+        if start is None:
+            del buf[:pos]
+            pos = 0
+
+    if depth or start is not None:
+        raise ValueError("Response ended inside a JSON value")
+
+def sections_as_arrays(result: Dict) -> Dict:
+    """Convert the hourly/daily/minutely_15 lists of one location into NumPy arrays in place."""
+    import numpy as np
+
+    for section in ("minutely_15", "hourly", "daily"):
+        data = result.get(section)
+        if not data:
+            continue
+        for name, values in data.items():
+            if name == "time" or name in ("sunrise", "sunset"):
+                data[name] = np.asarray(values)
+            else:
+                data[name] = np.asarray(values, dtype=np.float64)
+    return result
@@ -0,0 +1,70 @@
+"""Pooled, keep-alive HTTP transport for the Open-Meteo API."""
+
+import threading
+from typing import Dict, Optional
+
+# requests' exception types, importable from here without loading requests
+# until one is first used (e.g. when an except clause is evaluated)
+_REQUESTS_EXPORTS = ("RequestException", "ConnectionError", "Timeout")
+
+def __getattr__(name):
+    if name not in _REQUESTS_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import requests
+
+    value = getattr(requests, name)
+    globals()[name] = value
+    return value
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+class HTTPTransport:
+    """
+    Connection-pooled HTTP client that can be shared across threads.
+
+    Each thread gets its own requests.Session (sessions are not thread-safe),
+    but every session mounts the same HTTPAdapter, so they all draw from one
+    urllib3 connection pool and reuse its keep-alive connections.
+    """
+
+    def __init__(self,
+                 pool_connections: int = 4,
+                 pool_maxsize: int = 32,
+                 pool_block: bool = False,
+                 connect_timeout: float = 5.0,
+                 read_timeout: float = 30.0,
+                 headers: Optional[Dict[str, str]] = None):
+        # requests is imported here rather than at module level to keep startup cheap
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = (connect_timeout, read_timeout)
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self._adapter = HTTPAdapter(pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize,
+                                    pool_block=pool_block)
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url: str, params=None, stream: bool = False):
+        """Issue a GET request; the body is decompressed but left undecoded in response.content."""
+        # Template-built params carry their query string already encoded
+        params = getattr(params, "query", params)
+        return self._session().get(url, params=params, timeout=self.timeout, stream=stream)
+
+    def close(self):
+        self._adapter.close()
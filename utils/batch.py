@@ -0,0 +1,146 @@
+"""
+Non-interactive bulk forecasts.
+Reads zipcodes or "lat,lng" pairs, fetches their forecasts with bounded
+parallelism and streams one NDJSON record per location as results arrive.
+"""
+
+import json
+import math
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from models.Forecast import Forecast
+from models.Location import Location
+from models.weatherapi.request import ForecastRequestTemplate
+from utils.forecast_archive import location_key
+from utils.serialize import json_default
+
+
+def parse_coordinates(text):
+    """
+    Parse "lat,lng" into two floats. Raises ValueError unless both are finite
+    numbers with lat in [-90, 90] and lng in [-180, 180].
+    """
+    try:
+        lat, lng = (float(part) for part in text.split(",", 1))
+    except ValueError:
+        raise ValueError(f"invalid coordinates: {text}") from None
+    if not (math.isfinite(lat) and -90 <= lat <= 90):
+        raise ValueError(f"latitude must be between -90 and 90: {text}")
+    if not (math.isfinite(lng) and -180 <= lng <= 180):
+        raise ValueError(f"longitude must be between -180 and 180: {text}")
+    return lat, lng
+
+
+def resolve_location(line, zipcode_db, spatial_index=None):
+    """
+    Turn one input line into a Location, or None if it cannot be resolved.
+    Raises ValueError for a "lat,lng" line that parse_coordinates rejects.
+    """
+    if "," in line:
+        lat, lng = parse_coordinates(line)
+        nearest = spatial_index.nearest_location(lat, lng, zipcode_db) if spatial_index else None
+        if nearest is None:
+            return Location(lat, lng, '', '', line, 'GMT')
+        return Location(lat, lng, nearest.city, nearest.state, nearest.display_name, nearest.timezone)
+
+    return Location.from_zipcode(line.zfill(5), zipcode_db)
+
+
+def _fetch_group(weather_api, group, template):
+    forecasts = weather_api.get_forecasts([location for location, _ in group], template=template)
+    return list(zip(group, forecasts))
+
+
+def run_batch(lines, weather_api, zipcode_db, request, spatial_index=None,
+              output=sys.stdout, workers=4, group_size=100, dedupe=False, archive=None):
+    """
+    Stream NDJSON forecasts for every input line to `output`.
+
+    Resolved locations are fetched in multi-location requests of `group_size`,
+    with at most `workers` requests in flight. With `dedupe`, the whole input is
+    resolved first and locations sharing a model grid cell are fetched once,
+    whichever groups they would have fallen into. Responses are also appended
+    to `archive` (a ForecastArchive) when given. Returns a throughput summary.
+    """
+    started = time.perf_counter()
+    template = ForecastRequestTemplate(**request)
+    stats = {"records": 0, "ok": 0, "invalid": 0, "unresolved": 0, "failed": 0, "groups": 0}
+
+    def emit(record):
+        output.write(json.dumps(record, default=json_default) + "\n")
+        output.flush()
+        stats["records"] += 1
+
+    def resolved():
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                location = resolve_location(line, zipcode_db, spatial_index)
+            except ValueError as e:
+                stats["invalid"] += 1
+                emit({"input": line, "error": str(e)})
+                continue
+            if location is None:
+                stats["unresolved"] += 1
+                emit({"input": line, "error": "location not found"})
+                continue
+            yield line, location
+
+    # Work items are (location to request, [(input line, location), ...] it answers)
+    if dedupe:
+        entries = list(resolved())
+        unique, index = weather_api.dedupe_locations([location for _, location in entries], template)
+        members = [[] for _ in unique]
+        for entry, i in zip(entries, index):
+            members[i].append(entry)
+        work = zip(unique, members)
+        stats["dedupe_ratio"] = round(len(entries) / len(unique), 2) if unique else None
+    else:
+        work = ((location, [(line, location)]) for line, location in resolved())
+
+    def drain(done):
+        for future in done:
+            for (_, entries), response in future.result():
+                for line, location in entries:
+                    forecast = Forecast.from_response(location, response)
+                    if forecast is None:
+                        stats["failed"] += 1
+                        emit({"input": line, "location": location, "error": "forecast unavailable"})
+                    else:
+                        stats["ok"] += 1
+                        if archive is not None:
+                            archive.append(location_key(location), response)
+                        emit({"input": line, "location": location, "forecast": forecast.getSummary()})
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        group = []
+
+        def submit():
+            pending.add(executor.submit(_fetch_group, weather_api, list(group), template))
+            stats["groups"] += 1
+            group.clear()
+
+        for item in work:
+            group.append(item)
+            if len(group) >= group_size:
+                submit()
+            # Keep input reading at most one round ahead of the workers
+            while len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                drain(done)
+
+        if group:
+            submit()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            drain(done)
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["locations_per_second"] = round(stats["ok"] / elapsed, 1) if elapsed else None
+    return stats
@@ -35,4 +35,13 @@ WEATHER_CODES = {
         99: "Thunderstorm with heavy hail"
 }
 
-DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
\ No newline at end of file
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Forecast request used by the CLI, batch and server modes
+FORECAST_REQUEST = {
+    "hourly": ["temperature_2m", "weather_code", "precipitation"],
+    "daily": ["temperature_2m_max", "temperature_2m_min", "weather_code"],
+    "temperature_unit": "fahrenheit",
+    # Epoch seconds are shifted into local time with one vectorized add instead of parsing strings
+    "timeformat": "unixtime",
+}
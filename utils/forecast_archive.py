@@ -0,0 +1,211 @@
+"""
+On-disk archive of fetched forecasts.
+Each location gets one directory per section (hourly, daily) holding a
+time.i8 file of UTC epoch seconds and one <variable>.f8 file per variable,
+all the same length, plus meta.json. Appends write raw column bytes;
+queries memory-map the columns and slice by time, so reading months of data
+never parses JSON. A single writer per archive is assumed.
+"""
+
+import json
+import os
+
+import numpy as np
+
+SECTIONS = ("hourly", "daily")
+TIME_DTYPE = np.dtype("<i8")
+VALUE_DTYPE = np.dtype("<f8")
+
+# Variables whose values are timestamps; archived as UTC epoch seconds
+TIME_VARIABLES = ("sunrise", "sunset")
+
+
+def location_key(location):
+    """Directory name for a location: its coordinates to 4 places (about 10 m)."""
+    return f"{location.lat:.4f}_{location.lng:.4f}"
+
+
+def _epoch_seconds(values, utc_offset_seconds):
+    """ISO8601 local times or unixtime seconds -> int64 UTC epoch seconds."""
+    values = np.asarray(values)
+    if values.dtype.kind in "iuf":
+        return values.astype(np.int64)
+    return values.astype("datetime64[s]").astype(np.int64) - utc_offset_seconds
+
+
+def _to_datetime64(seconds):
+    return np.asarray(seconds, dtype=np.int64).astype("datetime64[s]")
+
+
+class ForecastArchive:
+    """
+    Append-only column store of forecast sections keyed by location.
+
+    Rows may be appended out of order or overlap earlier rows; queries and
+    compact() resolve duplicates in favour of the most recently appended row.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, key, section):
+        return os.path.join(self.root, key, section)
+
+    def _read_meta(self, path):
+        try:
+            with open(os.path.join(path, "meta.json")) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {"rows": 0, "sorted": True, "variables": []}
+
+    def _write_meta(self, path, meta):
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w") as file:
+            json.dump(meta, file)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+    def keys(self):
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def append(self, key, response):
+        """Append every hourly/daily section of one location's response; returns rows written per section."""
+        written = {}
+        offset = response.get("utc_offset_seconds", 0)
+        for section in SECTIONS:
+            data = response.get(section)
+            if not data or not len(data.get("time", ())):
+                continue
+            columns = {}
+            for name, values in data.items():
+                if name == "time":
+                    continue
+                if name in TIME_VARIABLES:
+                    columns[name] = _epoch_seconds(values, offset).astype(VALUE_DTYPE)
+                else:
+                    columns[name] = np.asarray(values, dtype=VALUE_DTYPE)
+            written[section] = self._append_section(self._dir(key, section),
+                                                    _epoch_seconds(data["time"], offset), columns)
+        return written
+
+    def _append_section(self, path, time, columns):
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_meta(path)
+        rows, count = meta["rows"], len(time)
+
+        # Drop bytes past meta["rows"] left by an interrupted append
+        def open_column(name, dtype):
+            filename = os.path.join(path, name)
+            file = open(filename, "ab")
+            file.truncate(rows * dtype.itemsize)
+            return file
+
+        with open_column("time.i8", TIME_DTYPE) as file:
+            if rows and meta["sorted"]:
+                last = np.memmap(os.path.join(path, "time.i8"), dtype=TIME_DTYPE, mode="r", shape=(rows,))[-1]
+                meta["sorted"] = bool(time[0] > last)
+            file.write(time.astype(TIME_DTYPE).tobytes())
+        meta["sorted"] = meta["sorted"] and bool(np.all(np.diff(time) > 0))
+
+        # Keep every column the same length: NaN-pad new variables and missing values.
+        # A new variable's file is rewritten from scratch; truncating it would zero-fill earlier rows
+        for name in set(columns) - set(meta["variables"]):
+            with open(os.path.join(path, f"{name}.f8"), "wb") as file:
+                file.write(np.full(rows, np.nan, dtype=VALUE_DTYPE).tobytes())
+            meta["variables"].append(name)
+        for name in meta["variables"]:
+            values = columns.get(name)
+            if values is None:
+                values = np.full(count, np.nan, dtype=VALUE_DTYPE)
+            with open_column(f"{name}.f8", VALUE_DTYPE) as file:
+                file.write(values.tobytes())
+
+        meta["rows"] = rows + count
+        self._write_meta(path, meta)
+        return count
+
+    def _columns(self, path, meta, names):
+        rows = meta["rows"]
+        time = np.memmap(os.path.join(path, "time.i8"), dtype=TIME_DTYPE, mode="r", shape=(rows,))
+        values = {}
+        for name in names:
+            if name in meta["variables"]:
+                values[name] = np.memmap(os.path.join(path, f"{name}.f8"), dtype=VALUE_DTYPE, mode="r", shape=(rows,))
+        return time, values
+
+    def query(self, key, variables, start=None, end=None, section="hourly"):
+        """
+        Rows of `variables` for one location with start <= time < end (UTC).
+        Returns (time as datetime64[s], {variable: float64 array}); variables
+        never archived for the location come back as NaN.
+        """
+        path = self._dir(key, section)
+        meta = self._read_meta(path)
+        if not meta["rows"]:
+            return np.empty(0, dtype="datetime64[s]"), {name: np.empty(0) for name in variables}
+
+        time, columns = self._columns(path, meta, variables)
+        lo = np.int64(np.datetime64(start, "s").astype(np.int64)) if start is not None else None
+        hi = np.int64(np.datetime64(end, "s").astype(np.int64)) if end is not None else None
+
+        if meta["sorted"]:
+            first = np.searchsorted(time, lo) if lo is not None else 0
+            last = np.searchsorted(time, hi) if hi is not None else len(time)
+            rows = slice(first, last)
+        else:
+            # Stable sort then keep the last appended row for each time
+            in_range = np.ones(len(time), dtype=bool)
+            if lo is not None:
+                in_range &= time >= lo
+            if hi is not None:
+                in_range &= time < hi
+            candidates = np.flatnonzero(in_range)
+            candidates = candidates[np.argsort(time[candidates], kind="stable")]
+            sorted_time = time[candidates]
+            keep = np.ones(len(candidates), dtype=bool)
+            keep[:-1] = sorted_time[1:] != sorted_time[:-1]
+            rows = candidates[keep]
+
+        selected = np.asarray(time[rows])
+        values = {}
+        for name in variables:
+            column = columns.get(name)
+            values[name] = np.array(column[rows]) if column is not None else np.full(len(selected), np.nan)
+        return _to_datetime64(selected), values
+
+    def query_many(self, keys, variable, start=None, end=None, section="hourly"):
+        """
+        One variable for many locations on a shared time axis.
+        Returns (time as datetime64[s], array of shape (len(keys), len(time))),
+        NaN where a location has no row for a time.
+        """
+        results = [self.query(key, [variable], start, end, section) for key in keys]
+        axis = np.unique(np.concatenate([time for time, _ in results])) if results else np.empty(0, "datetime64[s]")
+        matrix = np.full((len(keys), len(axis)), np.nan)
+        for row, (time, values) in enumerate(results):
+            matrix[row, np.searchsorted(axis, time)] = values[variable]
+        return axis, matrix
+
+    def compact(self, key=None):
+        """
+        Rewrite sections sorted by time with duplicate times removed (latest
+        append wins), so queries can binary-search. Returns rows removed.
+        """
+        removed = 0
+        for location in ([key] if key is not None else self.keys()):
+            for section in SECTIONS:
+                path = self._dir(location, section)
+                meta = self._read_meta(path)
+                if not meta["rows"] or meta["sorted"]:
+                    continue
+                time, values = self.query(location, meta["variables"], section=section)
+                files = [("time.i8", time.astype(np.int64).astype(TIME_DTYPE))]
+                files += [(f"{name}.f8", column.astype(VALUE_DTYPE)) for name, column in values.items()]
+                for name, column in files:
+                    with open(os.path.join(path, name + ".tmp"), "wb") as file:
+                        file.write(column.tobytes())
+                for name, _ in files:
+                    os.replace(os.path.join(path, name + ".tmp"), os.path.join(path, name))
+                removed += meta["rows"] - len(time)
+                self._write_meta(path, {"rows": len(time), "sorted": True, "variables": meta["variables"]})
+        return removed
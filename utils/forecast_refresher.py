@@ -0,0 +1,186 @@
+"""
+Incremental forecast refresh.
+Keeps one Forecast per location and, on a per-location schedule, re-requests
+only the leading hours (which move most between model runs) and the hours
+that rolled into the horizon since the last refresh, merging them into the
+stored arrays in place. Daily rows are only re-requested when the local date
+changes.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from models.Forecast import Forecast
+from models.Location import get_zoneinfo
+
+HOUR = np.timedelta64(1, "h")
+POLL_SECONDS = 1.0
+
+# Parameters that select the time range; the refresher sets its own
+RANGE_PARAMS = ("past_days", "forecast_days", "forecast_hours", "past_hours",
+                "start_date", "end_date", "start_hour", "end_hour")
+
+
+def local_hour(tz_name):
+    """Current wall-clock hour in tz_name as naive datetime64[s] (UTC if unknown)."""
+    now = datetime.now(get_zoneinfo(tz_name)).replace(minute=0, second=0, microsecond=0, tzinfo=None)
+    return np.datetime64(now, "s")
+
+
+def _iso(value, unit="m"):
+    return str(np.datetime64(value, unit))
+
+
+class ForecastRefresher:
+    """
+    Stored forecasts refreshed incrementally in the background.
+
+    Each refresh re-requests `stale_hours` leading hours plus any hours that
+    rolled into the horizon, as at most two start_hour/end_hour requests, and
+    merges them into the stored Forecast in place. Locations without a stored
+    forecast (or whose refresh cannot be done incrementally) are fetched in
+    full. Forecasts are updated in place, so readers may briefly see a
+    partially merged forecast.
+    """
+
+    def __init__(self, weather_api, request, interval=3600, stale_hours=6):
+        self.weather_api = weather_api
+        self.interval = interval
+        self.stale_hours = stale_hours
+        self.request = {k: v for k, v in request.items() if k not in RANGE_PARAMS}
+        self.stats = {"full": 0, "incremental": 0, "failed": 0, "hours_requested": 0}
+        self._entries = {}
+        self._queue = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._forecast_days = request.get("forecast_days", 7)
+
+    def add(self, key, location, forecast=None, interval=None):
+        """Track a location; without a stored forecast it is fetched on the next run."""
+        interval = interval or self.interval
+        due = time.monotonic() + (interval if forecast is not None else 0)
+        with self._lock:
+            self._entries[key] = [location, forecast, interval]
+            heapq.heappush(self._queue, (due, next(self._sequence), key))
+
+    def remove(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def refresh(self, key, now=None):
+        """Bring one location's forecast up to date; returns False if the fetch failed."""
+        location, forecast, _ = self._entries[key]
+        now = np.datetime64(now, "s") if now is not None else local_hour(location.timezone)
+
+        if forecast is None or not len(forecast.rollup().days):
+            forecast = self._fetch_full(location)
+        elif not self._fetch_incremental(location, forecast, now):
+            forecast = None
+
+        if forecast is None:
+            self.stats["failed"] += 1
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._entries[key][1] = forecast
+        return True
+
+    def _fetch_full(self, location):
+        response = self.weather_api.get_forecast(location.lat, location.lng, timezone=location.timezone,
+                                                 forecast_days=self._forecast_days, **self.request)
+        forecast = Forecast.from_response(location, response)
+        if forecast is not None:
+            self.stats["full"] += 1
+            self.stats["hours_requested"] += len(forecast.hourly_conditions)
+        return forecast
+
+    def _windows(self, hourly, now):
+        """[start, end] hour ranges to re-request so the table covers now .. now + its length."""
+        end = now + (len(hourly) - 1) * HOUR
+        filled = hourly.time[~np.isnat(hourly.time)]
+        last = filled[-1] if len(filled) else now - HOUR
+        lead_end = min(now + (self.stale_hours - 1) * HOUR, end)
+
+        if last <= lead_end:
+            return [(now, end)]
+        windows = [(now, lead_end)]
+        if last < end:
+            windows.append((last + HOUR, end))
+        return windows
+
+    def _fetch_incremental(self, location, forecast, now):
+        hourly_request = {k: v for k, v in self.request.items() if k != "daily"}
+        daily_request = {k: v for k, v in self.request.items() if k != "hourly"}
+
+        responses = []
+        if hourly_request.get("hourly"):
+            for start, end in self._windows(forecast.hourly_conditions, now):
+                response = self.weather_api.get_forecast(location.lat, location.lng, timezone=location.timezone,
+                                                         start_hour=_iso(start), end_hour=_iso(end),
+                                                         forecast_days=None, past_days=None, **hourly_request)
+                if not response:
+                    return False
+                responses.append(response)
+                self.stats["hours_requested"] += int((end - start) // HOUR) + 1
+
+        daily_response = None
+        daily = forecast.daily_conditions
+        today = now.astype("datetime64[D]")
+        if daily_request.get("daily") and len(daily) and daily.time[0] < today:
+            daily_response = self.weather_api.get_forecast(
+                location.lat, location.lng, timezone=location.timezone,
+                start_date=_iso(today, "D"), end_date=_iso(today + len(daily) - 1, "D"),
+                forecast_days=None, past_days=None, **daily_request)
+            if not daily_response:
+                return False
+
+        forecast.advance(now, responses, daily_response)
+        self.stats["incremental"] += 1
+        return True
+
+    def run_pending(self):
+        """Refresh every location that is due; returns how many were refreshed."""
+        count = 0
+        while not self._stop.is_set():
+            with self._lock:
+                if not self._queue or self._queue[0][0] > time.monotonic():
+                    return count
+                _, _, key = heapq.heappop(self._queue)
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                heapq.heappush(self._queue, (time.monotonic() + entry[2], next(self._sequence), key))
+            self.refresh(key)
+            count += 1
+        return count
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            with self._lock:
+                delay = self._queue[0][0] - time.monotonic() if self._queue else POLL_SECONDS
+            self._stop.wait(min(max(delay, 0), POLL_SECONDS))
+
+    def start(self):
+        """Start refreshing on a background daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="forecast-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
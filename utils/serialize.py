@@ -0,0 +1,16 @@
+"""
+JSON helpers for forecast payloads.
+"""
+
+import datetime
+
+
+def json_default(obj):
+    """`default=` hook for json.dumps covering dates, model objects and NumPy scalars."""
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,127 @@
+"""
+Long-running forecast HTTP service.
+The zipcode index, spatial index and WeatherAPI (with its connection pool
+and cache) are created once and shared by every request.
+
+    GET /forecast?zip=61554[&date=YYYY-MM-DD]
+    GET /forecast?lat=40.55&lng=-89.64[&date=YYYY-MM-DD]
+    GET /metrics
+    GET /health
+"""
+
+import datetime
+import json
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from models.Forecast import Forecast
+from models.weatherapi.WeatherAPI import WeatherAPI
+from models.weatherapi.cache import ForecastCache
+from models.weatherapi.request import ForecastRequestTemplate
+from models.weatherapi.scheduler import make_scheduler
+from models.weatherapi.instrumentation import MetricsRecorder
+from utils.batch import resolve_location
+from utils.serialize import json_default
+
+
+class ForecastService:
+    """Warm in-process state shared by all request handlers."""
+
+    def __init__(self, zipcode_db, spatial_index, request, weather_api=None, metrics=None, rate_limit=None):
+        self.zipcode_db = zipcode_db
+        self.spatial_index = spatial_index
+        self.request = request
+        self.template = ForecastRequestTemplate(**request)
+        self.metrics = metrics or MetricsRecorder()
+        self.weather_api = weather_api or WeatherAPI(cache=ForecastCache(), instrumentation=self.metrics,
+                                                     scheduler=make_scheduler(rate_limit))
+
+    def day_forecast(self, query):
+        """Return (status, payload) for a /forecast query."""
+        if "zip" in query:
+            line = query["zip"]
+        elif "lat" in query and "lng" in query:
+            line = f"{query['lat']},{query['lng']}"
+        else:
+            return 400, {"error": "expected zip= or lat=&lng="}
+
+        try:
+            location = resolve_location(line, self.zipcode_db, self.spatial_index)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        if location is None:
+            return 404, {"error": f"location not found: {line}"}
+
+        date = None
+        if "date" in query:
+            try:
+                date = datetime.datetime.strptime(query["date"], "%Y-%m-%d")
+            except ValueError:
+                return 400, {"error": "date must be YYYY-MM-DD"}
+
+        response = self.weather_api.get_forecast(location.lat, location.lng,
+                                                 timezone=location.timezone, template=self.template)
+        forecast = Forecast.from_response(location, response, self.metrics)
+        if forecast is None:
+            return 502, {"error": "forecast unavailable"}
+
+        day = forecast.getDayForecast(date)
+        if day is None:
+            return 404, {"error": "date outside forecast range"}
+        return 200, day
+
+
+class ForecastRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are dropped after this many seconds
+    timeout = 5
+    service = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/forecast":
+            status, payload = self.service.day_forecast(query)
+            self._send(status, json.dumps(payload, default=json_default).encode(), "application/json")
+        elif url.path == "/metrics":
+            self._send(200, self.service.metrics.to_prometheus().encode(), "text/plain; version=0.0.4")
+        elif url.path == "/health":
+            self._send(200, b'{"status": "ok"}', "application/json")
+        else:
+            self._send(404, b'{"error": "not found"}', "application/json")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(service, host="127.0.0.1", port=8080):
+    """Serve until SIGINT/SIGTERM, then finish in-flight requests and release resources."""
+    handler = type("BoundForecastRequestHandler", (ForecastRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    # Non-daemon threads so server_close() waits for in-flight requests
+    server.daemon_threads = False
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so it can't run on the serving thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"Serving forecasts on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.weather_api.close()
+        print("Server stopped.")
@@ -0,0 +1,195 @@
+"""
+Location table in shared memory for multi-process workers.
+One process builds the table into a multiprocessing.shared_memory segment:
+a sorted zipcode column, lat/lng columns, and int32 ids into an interned
+string table for city, state and timezone. Workers attach to the segment by
+name and read it in place, so the table exists once however many workers
+there are.
+"""
+
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from models.Location import Location
+
+MAGIC = b"SHMLOC1\0"
+HEADER = struct.Struct("<8sII")
+
+# Interned text fields, in column order
+STRING_FIELDS = ("city", "state_id", "state_name", "timezone")
+
+
+def _layout(count, string_count):
+    """(name, dtype, length) of each array in the segment, in order after the header."""
+    return [("zip", np.dtype("S5"), count),
+            ("lat", np.dtype("<f8"), count),
+            ("lng", np.dtype("<f8"), count),
+            *[(field, np.dtype("<i4"), count) for field in STRING_FIELDS],
+            ("string_offsets", np.dtype("<i8"), string_count + 1)]
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+class SharedLocationTable:
+    """
+    Read-only zipcode -> location mapping stored in shared memory.
+
+    Behaves like the mapping from load_zipcode_database (get, [], in, len,
+    iteration) so it can be passed anywhere a zipcode_db is expected. The
+    creating process owns the segment and unlinks it on close(); attached
+    workers only detach.
+    """
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name
+        self._strings = {}
+
+        buffer = shm.buf.toreadonly()
+        magic, count, string_count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"shared memory segment {shm.name} is not a location table")
+
+        offset = HEADER.size
+        self._columns = {}
+        for name, dtype, length in _layout(count, string_count):
+            offset = _align(offset)
+            self._columns[name] = np.frombuffer(buffer, dtype=dtype, count=length, offset=offset)
+            offset += dtype.itemsize * length
+        self._blob = buffer[_align(offset):]
+        self._buffer = buffer
+
+    @classmethod
+    def create(cls, zipcode_db, name=None):
+        """Build the table from a zipcode mapping (dict or ZipcodeIndex) into a new segment."""
+        zipcodes = sorted(zipcode_db)
+        count = len(zipcodes)
+        interned = {}
+        ids = {field: np.empty(count, dtype="<i4") for field in STRING_FIELDS}
+        lats = np.empty(count)
+        lngs = np.empty(count)
+        for i, zipcode in enumerate(zipcodes):
+            row = zipcode_db[zipcode]
+            lats[i], lngs[i] = row['lat'], row['lng']
+            for field in STRING_FIELDS:
+                ids[field][i] = interned.setdefault(row.get(field, ''), len(interned))
+
+        encoded = [text.encode("utf-8") for text in interned]
+        offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        arrays = {"zip": np.array([z.encode("ascii") for z in zipcodes], dtype="S5"),
+                  "lat": lats, "lng": lngs, **ids, "string_offsets": offsets}
+
+        size = HEADER.size
+        for _, dtype, length in _layout(count, len(encoded)):
+            size = _align(size) + dtype.itemsize * length
+        size = _align(size) + int(offsets[-1])
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        try:
+            HEADER.pack_into(shm.buf, 0, MAGIC, count, len(encoded))
+            offset = HEADER.size
+            for column, dtype, length in _layout(count, len(encoded)):
+                offset = _align(offset)
+                shm.buf[offset:offset + dtype.itemsize * length] = arrays[column].astype(dtype).tobytes()
+                offset += dtype.itemsize * length
+            offset = _align(offset)
+            shm.buf[offset:offset + int(offsets[-1])] = b"".join(encoded)
+            return cls(shm, owner=True)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name):
+        """Attach read-only to a table created by another process."""
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False), owner=False)
+
+        # Attaching registers the segment with this process's resource tracker.
+        # Workers started by multiprocessing share the creator's tracker, where
+        # that is harmless; a tracker of our own would unlink the segment when
+        # this process exits, so the registration is dropped.
+        shared_tracker = resource_tracker._resource_tracker._fd is not None
+        shm = shared_memory.SharedMemory(name=name)
+        if not shared_tracker:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Detach; the owner also unlinks the segment so the memory is freed.
+        Arrays obtained from columns() must be dropped first.
+        """
+        if self._shm is None:
+            return
+        # Views must be released before the segment can be closed
+        self._columns = {}
+        self._blob.release()
+        self._buffer.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def _string(self, index):
+        text = self._strings.get(index)
+        if text is None:
+            offsets = self._columns["string_offsets"]
+            text = bytes(self._blob[offsets[index]:offsets[index + 1]]).decode("utf-8")
+            self._strings[index] = text
+        return text
+
+    def _find(self, zipcode):
+        key = str(zipcode).zfill(5).encode("ascii")
+        zips = self._columns["zip"]
+        i = int(np.searchsorted(zips, key))
+        return i if i < len(zips) and zips[i] == key else -1
+
+    def _row(self, i):
+        row = {'zip': self._columns["zip"][i].decode("ascii"),
+               'lat': float(self._columns["lat"][i]),
+               'lng': float(self._columns["lng"][i])}
+        for field in STRING_FIELDS:
+            row[field] = self._string(int(self._columns[field][i]))
+        return row
+
+    def get(self, zipcode, default=None):
+        i = self._find(zipcode)
+        return self._row(i) if i >= 0 else default
+
+    def __getitem__(self, zipcode):
+        i = self._find(zipcode)
+        if i < 0:
+            raise KeyError(zipcode)
+        return self._row(i)
+
+    def __contains__(self, zipcode):
+        return self._find(zipcode) >= 0
+
+    def __len__(self):
+        return len(self._columns["zip"])
+
+    def __iter__(self):
+        for zipcode in self._columns["zip"]:
+            yield zipcode.decode("ascii")
+
+    def columns(self):
+        """(zipcodes, lats, lngs) as read-only arrays over the shared segment."""
+        return self._columns["zip"], self._columns["lat"], self._columns["lng"]
+
+    def location(self, zipcode):
+        return Location.from_zipcode(zipcode, self)
@@ -0,0 +1,236 @@
+"""
+Spatial index over the zipcode database for reverse lookups from lat/lng.
+Points are bucketed into a regular lat/lng grid and stored sorted by cell, so
+every row of a search box is one contiguous slice of the coordinate arrays.
+"""
+
+import numpy as np
+
+from models.Location import Location
+from utils.shared_locations import SharedLocationTable
+from utils.zipcode_index import RECORD, ZipcodeIndex
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180.0
+
+# numpy view of utils.zipcode_index.RECORD
+RECORD_DTYPE = np.dtype([
+    ('zip', 'S5'), ('lat', '<f8'), ('lng', '<f8'), ('city', 'S48'),
+    ('state_id', 'S2'), ('state_name', 'S24'), ('timezone', 'S32'),
+])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+
+def _group_order(owner, dist):
+    """
+    Order sorting candidates by (owner, dist). One float argsort of a combined
+    key is several times faster than np.lexsort; rounding can only swap
+    candidates of one query whose distances agree to within a few centimetres.
+    """
+    span = dist.max() + 1.0 if len(dist) else 1.0
+    return np.argsort(owner * span + dist)
+
+
+def haversine_km(lat, lng, lats, lngs):
+    lat, lng = np.radians(lat), np.radians(lng)
+    lats, lngs = np.radians(lats), np.radians(lngs)
+    a = (np.sin((lats - lat) / 2) ** 2
+         + np.cos(lat) * np.cos(lats) * np.sin((lngs - lng) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Grid-bucketed nearest-neighbour and radius search over zipcode coordinates.
+    Longitudes are not wrapped across the antimeridian.
+    """
+
+    def __init__(self, zipcodes, lats, lngs, cell_deg=0.5):
+        self.cell_deg = cell_deg
+        self._ncols = int(np.ceil(360.0 / cell_deg)) + 1
+        self._nrows = int(np.ceil(180.0 / cell_deg)) + 1
+
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        cells = self._rows(lats) * self._ncols + self._cols(lngs)
+        order = np.argsort(cells, kind="stable")
+
+        self.zipcodes = np.asarray(zipcodes)[order]
+        self.lats = lats[order]
+        self.lngs = lngs[order]
+        self._cells = cells[order]
+
+    @classmethod
+    def from_zipcode_db(cls, zipcode_db, cell_deg=0.5):
+        if isinstance(zipcode_db, ZipcodeIndex):
+            records = np.frombuffer(zipcode_db.buffer(), dtype=RECORD_DTYPE)
+            zipcodes = records['zip'].astype(str)
+            return cls(zipcodes, records['lat'].copy(), records['lng'].copy(), cell_deg)
+
+        if isinstance(zipcode_db, SharedLocationTable):
+            zipcodes, lats, lngs = zipcode_db.columns()
+            return cls(zipcodes.astype(str), lats.copy(), lngs.copy(), cell_deg)
+
+        zipcodes = list(zipcode_db)
+        lats = [zipcode_db[z]['lat'] for z in zipcodes]
+        lngs = [zipcode_db[z]['lng'] for z in zipcodes]
+        return cls(np.array(zipcodes), lats, lngs, cell_deg)
+
+    def __len__(self):
+        return len(self.zipcodes)
+
+    def _rows(self, lats):
+        return np.floor((np.asarray(lats) + 90.0) / self.cell_deg).astype(np.int64)
+
+    def _cols(self, lngs):
+        return np.floor((np.asarray(lngs) + 180.0) / self.cell_deg).astype(np.int64)
+
+    def _box(self, row0, row1, col0, col1):
+        """Indices of all points in the inclusive cell box, one slice per grid row."""
+        row0, row1 = max(row0, 0), min(row1, self._nrows - 1)
+        col0, col1 = max(col0, 0), min(col1, self._ncols - 1)
+        if row0 > row1 or col0 > col1:
+            return np.empty(0, dtype=np.int64)
+        rows = np.arange(row0, row1 + 1) * self._ncols
+        starts = np.searchsorted(self._cells, rows + col0, side="left")
+        ends = np.searchsorted(self._cells, rows + col1, side="right")
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+
+    def nearest(self, lat, lng, n=1):
+        """Return (indices, distances_km) of the n nearest points, closest first."""
+        n = min(n, len(self))
+        if n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        row, col = int(self._rows(lat)), int(self._cols(lng))
+        radius = 0
+        while True:
+            candidates = self._box(row - radius, row + radius, col - radius, col + radius)
+            if len(candidates) >= n:
+                dist = haversine_km(lat, lng, self.lats[candidates], self.lngs[candidates])
+                top = np.argpartition(dist, n - 1)[:n]
+                top = top[np.argsort(dist[top])]
+                # Anything outside the box is at least `radius` cells away
+                edge_lat = min(abs(lat) + (radius + 1) * self.cell_deg, 90.0)
+                covered_km = radius * self.cell_deg * KM_PER_DEGREE * np.cos(np.radians(edge_lat))
+                if dist[top[-1]] <= covered_km or len(candidates) == len(self):
+                    return candidates[top], dist[top]
+            if radius > max(self._nrows, self._ncols):
+                return candidates[:0], np.empty(0)
+            radius = radius * 2 if radius else 1
+
+    def within_radius(self, lat, lng, radius_km):
+        """Return (indices, distances_km) of all points within radius_km, closest first."""
+        dlat = radius_km / KM_PER_DEGREE
+        edge_lat = min(abs(lat) + dlat, 89.999)
+        dlng = min(dlat / np.cos(np.radians(edge_lat)), 180.0)
+
+        candidates = self._box(int(self._rows(lat - dlat)), int(self._rows(lat + dlat)),
+                               int(self._cols(lng - dlng)), int(self._cols(lng + dlng)))
+        dist = haversine_km(lat, lng, self.lats[candidates], self.lngs[candidates])
+        keep = dist <= radius_km
+        candidates, dist = candidates[keep], dist[keep]
+        order = np.argsort(dist)
+        return candidates[order], dist[order]
+
+    def _boxes(self, row0, row1, col0, col1):
+        """
+        Points in one inclusive cell box per query, gathered for all queries at
+        once. Returns (owner, indices): the query each candidate belongs to,
+        grouped by query in order, and the candidate's point index.
+        """
+        row0, row1 = np.maximum(row0, 0), np.minimum(row1, self._nrows - 1)
+        col0, col1 = np.maximum(col0, 0), np.minimum(col1, self._ncols - 1)
+        nrows = np.where(col0 <= col1, np.maximum(row1 - row0 + 1, 0), 0)
+
+        # One entry per (query, grid row), then one per point in that row's slice
+        row_owner = np.repeat(np.arange(len(nrows)), nrows)
+        rows = row0[row_owner] + np.arange(len(row_owner)) - np.repeat(np.cumsum(nrows) - nrows, nrows)
+        starts = np.searchsorted(self._cells, rows * self._ncols + col0[row_owner], side="left")
+        ends = np.searchsorted(self._cells, rows * self._ncols + col1[row_owner], side="right")
+        lengths = ends - starts
+        owner = np.repeat(row_owner, lengths)
+        indices = np.arange(len(owner)) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return owner, indices
+
+    def _ranked(self, owner, indices, lats, lngs, count):
+        """Sort candidates by (query, distance); returns them with distances and each one's rank in its query."""
+        dist = haversine_km(lats[owner], lngs[owner], self.lats[indices], self.lngs[indices])
+        order = _group_order(owner, dist)
+        owner, indices, dist = owner[order], indices[order], dist[order]
+        sizes = np.bincount(owner, minlength=count)
+        rank = np.arange(len(owner)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        return owner, indices, dist, rank, sizes
+
+    def nearest_many(self, lats, lngs, n=1):
+        """
+        Batch nearest query; returns (indices, distances_km) arrays of shape
+        (len(lats), n), padded with -1/inf when there are fewer points. Every
+        unresolved query grows its search box in lockstep, so each round is one
+        vectorized gather and haversine over all of them.
+        """
+        lats, lngs = np.asarray(lats, dtype=np.float64), np.asarray(lngs, dtype=np.float64)
+        n = max(min(n, len(self)), 0)
+        indices = np.full((len(lats), n), -1, dtype=np.int64)
+        distances = np.full((len(lats), n), np.inf)
+        if n == 0:
+            return indices, distances
+
+        rows, cols = self._rows(lats), self._cols(lngs)
+        pending = np.arange(len(lats))
+        radius = 0
+        while len(pending):
+            owner, candidates = self._boxes(rows[pending] - radius, rows[pending] + radius,
+                                            cols[pending] - radius, cols[pending] + radius)
+            owner, candidates, dist, rank, sizes = self._ranked(owner, candidates, lats[pending],
+                                                                lngs[pending], len(pending))
+            # Anything outside the box is at least `radius` cells away
+            edge_lat = np.minimum(np.abs(lats[pending]) + (radius + 1) * self.cell_deg, 90.0)
+            covered_km = radius * self.cell_deg * KM_PER_DEGREE * np.cos(np.radians(edge_lat))
+            kth = np.full(len(pending), np.inf)
+            last = rank == n - 1
+            kth[owner[last]] = dist[last]
+            done = (sizes >= n) & ((kth <= covered_km) | (sizes == len(self)))
+
+            top = (rank < n) & done[owner]
+            indices[pending[owner[top]], rank[top]] = candidates[top]
+            distances[pending[owner[top]], rank[top]] = dist[top]
+
+            if radius > max(self._nrows, self._ncols):
+                break
+            pending = pending[~done]
+            radius = radius * 2 if radius else 1
+        return indices, distances
+
+    def within_radius_many(self, lats, lngs, radius_km):
+        """
+        Batch radius query; returns one (indices, distances_km) pair per point,
+        closest first. All boxes are gathered and measured in one pass.
+        """
+        lats, lngs = np.asarray(lats, dtype=np.float64), np.asarray(lngs, dtype=np.float64)
+        dlat = radius_km / KM_PER_DEGREE
+        edge_lat = np.minimum(np.abs(lats) + dlat, 89.999)
+        dlng = np.minimum(dlat / np.cos(np.radians(edge_lat)), 180.0)
+
+        owner, candidates = self._boxes(self._rows(lats - dlat), self._rows(lats + dlat),
+                                        self._cols(lngs - dlng), self._cols(lngs + dlng))
+        dist = haversine_km(lats[owner], lngs[owner], self.lats[candidates], self.lngs[candidates])
+        keep = dist <= radius_km
+        owner, candidates, dist = owner[keep], candidates[keep], dist[keep]
+        if not len(lats):
+            return []
+        order = _group_order(owner, dist)
+        owner, candidates, dist = owner[order], candidates[order], dist[order]
+
+        bounds = np.searchsorted(owner, np.arange(1, len(lats)))
+        return list(zip(np.split(candidates, bounds), np.split(dist, bounds)))
+
+    def nearest_zipcodes(self, lat, lng, n=1):
+        indices, _ = self.nearest(lat, lng, n)
+        return [str(z) for z in self.zipcodes[indices]]
+
+    def nearest_location(self, lat, lng, zipcode_db):
+        zipcodes = self.nearest_zipcodes(lat, lng, 1)
+        if not zipcodes:
+            return None
+        return Location.from_zipcode(zipcodes[0], zipcode_db)
@@ -0,0 +1,174 @@
+"""
+Compiled, memory-mapped zipcode index.
+The CSV database is compiled once into a sorted file of fixed-width records
+that is memory-mapped and searched by zipcode, so workers pay no parse cost
+and share the same pages.
+"""
+
+import csv
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent compiles still each write their own temp file
+    fcntl = None
+
+MAGIC = b"ZIPIDX1\0"
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<5sdd48s2s24s32s")
+
+# (name, width) of each fixed-width text field, in record order after lat/lng
+TEXT_FIELDS = [("city", 48), ("state_id", 2), ("state_name", 24), ("timezone", 32)]
+
+DEFAULT_CSV = "utils/zipcodes.csv"
+DEFAULT_INDEX = "utils/zipcodes.idx"
+
+
+def _fixed(value, width):
+    # Truncate on a character boundary so multi-byte names stay decodable
+    data = value.encode("utf-8")[:width]
+    return data.decode("utf-8", "ignore").encode("utf-8")
+
+
+def compile_zipcode_index(csv_filename=DEFAULT_CSV, index_filename=DEFAULT_INDEX):
+    rows = []
+    with open(csv_filename, 'r', newline='') as file:
+        for row in csv.DictReader(file):
+            rows.append((
+                str(row['zip']).zfill(5).encode("ascii"),
+                float(row['lat']),
+                float(row['lng']),
+                _fixed(row['city'], 48),
+                _fixed(row['state_id'], 2),
+                _fixed(row['state_name'], 24),
+                _fixed(row['timezone'], 32),
+            ))
+    rows.sort(key=lambda r: r[0])
+
+    # A private temp file per process, so concurrent compiles never touch each other's output
+    fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(index_filename)),
+                                        prefix=os.path.basename(index_filename), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, len(rows), RECORD.size))
+            for row in rows:
+                out.write(RECORD.pack(*row))
+        os.chmod(tmp_filename, 0o644)
+        os.replace(tmp_filename, index_filename)
+    except BaseException:
+        os.unlink(tmp_filename)
+        raise
+    return len(rows)
+
+
+class ZipcodeIndex:
+    """
+    Read-only mapping of zipcode -> location row backed by a compiled index file.
+    Rows have the same shape as the entries built by load_zipcode_database.
+    """
+
+    def __init__(self, index_filename=DEFAULT_INDEX):
+        self.filename = index_filename
+        with open(index_filename, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, record_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{index_filename} is not a compatible zipcode index")
+
+    def _zip_at(self, i):
+        offset = HEADER.size + i * RECORD.size
+        return self._mm[offset:offset + 5]
+
+    def _find(self, zipcode):
+        key = str(zipcode).zfill(5).encode("ascii")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._zip_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._zip_at(lo) == key:
+            return lo
+        return -1
+
+    def _row(self, i):
+        zipcode, lat, lng, *text = RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+        row = {'zip': zipcode.decode("ascii"), 'lat': lat, 'lng': lng}
+        for (name, _), value in zip(TEXT_FIELDS, text):
+            row[name] = value.rstrip(b"\0").decode("utf-8")
+        return row
+
+    def get(self, zipcode, default=None):
+        i = self._find(zipcode)
+        return self._row(i) if i >= 0 else default
+
+    def __getitem__(self, zipcode):
+        i = self._find(zipcode)
+        if i < 0:
+            raise KeyError(zipcode)
+        return self._row(i)
+
+    def __contains__(self, zipcode):
+        return self._find(zipcode) >= 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._zip_at(i).decode("ascii")
+
+    def buffer(self):
+        """Raw record bytes (without header), for building column views."""
+        return memoryview(self._mm)[HEADER.size:HEADER.size + self._count * RECORD.size]
+
+    def close(self):
+        self._mm.close()
+
+
+def _is_stale(index_filename, csv_filename):
+    return (not os.path.exists(index_filename)
+            or (os.path.exists(csv_filename)
+                and os.path.getmtime(csv_filename) > os.path.getmtime(index_filename)))
+
+
+@contextmanager
+def _compile_lock(index_filename):
+    """Hold an exclusive lock next to the index so only one process compiles it at a time."""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{index_filename}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def load_zipcode_index(index_filename=DEFAULT_INDEX, csv_filename=DEFAULT_CSV):
+    if _is_stale(index_filename, csv_filename):
+        if not os.path.exists(csv_filename):
+            print(f"Error: Could not find {csv_filename}")
+            return {}
+        try:
+            with _compile_lock(index_filename):
+                # Another process may have compiled it while we waited for the lock
+                if _is_stale(index_filename, csv_filename):
+                    count = compile_zipcode_index(csv_filename, index_filename)
+                    print(f"Compiled {count} locations into {index_filename}.")
+        except Exception as e:
+            print(f"Error compiling zipcode index from {csv_filename}: {e}")
+            return {}
+
+    try:
+        return ZipcodeIndex(index_filename)
+    except Exception as e:
+        print(f"Error loading zipcode index: {e}")
+        return {}